@@ -14,9 +14,21 @@ from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.typing import ConfigType
 
-from .const import CONF_INSTALLER_CODE, CONF_USER_CODE, DOMAIN
+from .const import (
+    CONF_DEVICE_LAYOUT,
+    CONF_INSTALLER_CODE,
+    CONF_USER_CODE,
+    DEVICE_LAYOUT_DEVICES,
+    DOMAIN,
+)
+from .devices import BoschAlarmDevices
+from .dispatcher import BoschAlarmDispatcher
+from .history import BoschAlarmHistorySync
+from .inventory import BoschAlarmInventoryStore
+from .reconnect import BoschAlarmReconnectSupervisor
 from .services import setup_services
-from .types import BoschAlarmConfigEntry
+from .startup import async_get_startup_priority, async_get_startup_scheduler
+from .types import BoschAlarmConfigEntry, BoschAlarmData
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
@@ -46,21 +58,40 @@ async def async_setup_entry(hass: HomeAssistant, entry: BoschAlarmConfigEntry) -
             CONF_INSTALLER_CODE, entry.data.get(CONF_USER_CODE)
         ),
     )
-    try:
-        await panel.connect()
-    except (PermissionError, ValueError) as err:
-        await panel.disconnect()
-        raise ConfigEntryAuthFailed(
-            translation_domain=DOMAIN, translation_key="authentication_failed"
-        ) from err
-    except (TimeoutError, OSError, ConnectionRefusedError, SSLError) as err:
-        await panel.disconnect()
-        raise ConfigEntryNotReady(
-            translation_domain=DOMAIN,
-            translation_key="cannot_connect",
-        ) from err
-
-    entry.runtime_data = panel
+    inventory = BoschAlarmInventoryStore(hass, entry)
+    # Entities are set up from a stored snapshot of the inventory when there is
+    # one, and the panel is connected to in the background.
+    if not (from_snapshot := await inventory.async_load(panel)):
+        try:
+            async with async_get_startup_scheduler(hass).async_admit(
+                hass, entry.entry_id, async_get_startup_priority(hass, entry.entry_id)
+            ):
+                await panel.connect()
+        except (PermissionError, ValueError) as err:
+            await panel.disconnect()
+            raise ConfigEntryAuthFailed(
+                translation_domain=DOMAIN, translation_key="authentication_failed"
+            ) from err
+        except (TimeoutError, OSError, ConnectionRefusedError, SSLError) as err:
+            await panel.disconnect()
+            raise ConfigEntryNotReady(
+                translation_domain=DOMAIN,
+                translation_key="cannot_connect",
+            ) from err
+        await inventory.async_save(panel)
+
+    devices = BoschAlarmDevices(
+        panel,
+        entry.unique_id or entry.entry_id,
+        entry.options.get(CONF_DEVICE_LAYOUT, DEVICE_LAYOUT_DEVICES),
+    )
+    history = BoschAlarmHistorySync(hass, entry)
+    supervisor = BoschAlarmReconnectSupervisor(hass, entry, panel)
+    entry.runtime_data = BoschAlarmData(
+        panel, BoschAlarmDispatcher(hass, panel), devices, history, supervisor
+    )
+    await history.async_start(panel)
+    supervisor.async_start()
 
     device_registry = dr.async_get(hass)
 
@@ -69,15 +100,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: BoschAlarmConfigEntry) -
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
         connections={(CONNECTION_NETWORK_MAC, mac)} if mac else set(),
-        identifiers={(DOMAIN, entry.unique_id or entry.entry_id)},
-        name=f"Bosch {panel.model}",
-        manufacturer="Bosch Security Systems",
         model=panel.model,
         sw_version=panel.firmware_version,
+        **devices.panel,
     )
+    devices.async_provision(hass, entry.entry_id)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    if from_snapshot:
+        entry.async_create_background_task(
+            hass, inventory.async_reconcile(panel), f"{DOMAIN}_reconcile_inventory"
+        )
     return True
 
+async def async_update_options(hass: HomeAssistant, entry: BoschAlarmConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: BoschAlarmConfigEntry) -> bool:
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -115,8 +154,16 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: BoschAlarmConfi
     _LOGGER.debug("Migration to version %s successful", config_entry.version)
     return True
 
+async def async_remove_entry(hass: HomeAssistant, entry: BoschAlarmConfigEntry) -> None:
+    """Remove the stored inventory and history cursor of a config entry."""
+    await BoschAlarmInventoryStore(hass, entry).async_remove()
+    await BoschAlarmHistorySync(hass, entry).async_remove()
+
 async def async_unload_entry(hass: HomeAssistant, entry: BoschAlarmConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        await entry.runtime_data.disconnect()
+        entry.runtime_data.dispatcher.async_shutdown()
+        await entry.runtime_data.history.async_shutdown()
+        await entry.runtime_data.supervisor.async_shutdown()
+        await entry.runtime_data.panel.disconnect()
     return unload_ok
@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-from bosch_alarm_mode2 import Panel
-
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntity,
     AlarmControlPanelEntityFeature,
     AlarmControlPanelState,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
+from .commands import PRIORITY_ARM, PRIORITY_DISARM, TARGET_AREA
+from .confirmations import area_armed, area_disarmed
+from .const import SIGNAL_INVENTORY_ADDED
 from .entity import BoschAlarmAreaEntity
-from .types import BoschAlarmConfigEntry
+from .inventory import PanelInventory
+from .types import BoschAlarmConfigEntry, BoschAlarmData
 
 
 async def async_setup_entry(
@@ -22,15 +25,26 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up control panels for each area."""
-    panel = config_entry.runtime_data
+    data = config_entry.runtime_data
+
+    @callback
+    def async_add_inventory(inventory: PanelInventory) -> None:
+        async_add_entities(
+            AreaAlarmControlPanel(
+                data,
+                area_id,
+                config_entry.unique_id or config_entry.entry_id,
+            )
+            for area_id in inventory.areas
+        )
 
-    async_add_entities(
-        AreaAlarmControlPanel(
-            panel,
-            area_id,
-            config_entry.unique_id or config_entry.entry_id,
+    async_add_inventory(PanelInventory.from_panel(data.panel))
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_INVENTORY_ADDED.format(config_entry.entry_id),
+            async_add_inventory,
         )
-        for area_id in panel.areas
     )
 
 
@@ -48,9 +62,9 @@ class AreaAlarmControlPanel(BoschAlarmAreaEntity, AlarmControlPanelEntity):
     _attr_code_arm_required = False
     _attr_name = None
 
-    def __init__(self, panel: Panel, area_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, area_id: int, unique_id: str) -> None:
         """Initialise a Bosch Alarm control panel entity."""
-        super().__init__(panel, area_id, unique_id, True, False, True)
+        super().__init__(data, area_id, unique_id, True, False, True)
         self._attr_unique_id = self._area_unique_id
 
     @property
@@ -72,12 +86,30 @@ class AreaAlarmControlPanel(BoschAlarmAreaEntity, AlarmControlPanelEntity):
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Disarm this panel."""
-        await self.panel.area_disarm(self._area_id)
+        await self._dispatcher.async_command(
+            self.panel.area_disarm,
+            self._area_id,
+            target=TARGET_AREA,
+            priority=PRIORITY_DISARM,
+            expect=area_disarmed(self._area),
+        )
 
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send arm home command."""
-        await self.panel.area_arm_part(self._area_id)
+        await self._dispatcher.async_command(
+            self.panel.area_arm_part,
+            self._area_id,
+            target=TARGET_AREA,
+            priority=PRIORITY_ARM,
+            expect=area_armed(self._area, away=False),
+        )
 
     async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send arm away command."""
-        await self.panel.area_arm_all(self._area_id)
+        await self._dispatcher.async_command(
+            self.panel.area_arm_all,
+            self._area_id,
+            target=TARGET_AREA,
+            priority=PRIORITY_ARM,
+            expect=area_armed(self._area, away=True),
+        )
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from bosch_alarm_mode2 import Panel
 from bosch_alarm_mode2.const import ALARM_PANEL_FAULTS
 
 from homeassistant.components.binary_sensor import (
@@ -13,11 +12,15 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import BoschAlarmConfigEntry
+from .const import SIGNAL_INVENTORY_ADDED
 from .entity import BoschAlarmAreaEntity, BoschAlarmEntity, BoschAlarmPointEntity
+from .inventory import PanelInventory
+from .types import BoschAlarmData
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -119,37 +122,48 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up binary sensors for alarm points and the connection status."""
-    panel = config_entry.runtime_data
+    data = config_entry.runtime_data
 
-    entities: list[BinarySensorEntity] = [
-        PointSensor(panel, point_id, config_entry.unique_id or config_entry.entry_id)
-        for point_id in panel.points
-    ]
-
-    entities.extend(
+    async_add_entities(
         PanelFaultsSensor(
-            panel,
+            data,
             config_entry.unique_id or config_entry.entry_id,
             fault_type,
         )
         for fault_type in FAULT_TYPES
     )
 
-    entities.extend(
-        AreaReadyToArmSensor(
-            panel, area_id, config_entry.unique_id or config_entry.entry_id, "away"
+    @callback
+    def async_add_inventory(inventory: PanelInventory) -> None:
+        entities: list[BinarySensorEntity] = [
+            PointSensor(data, point_id, config_entry.unique_id or config_entry.entry_id)
+            for point_id in inventory.points
+        ]
+
+        entities.extend(
+            AreaReadyToArmSensor(
+                data, area_id, config_entry.unique_id or config_entry.entry_id, "away"
+            )
+            for area_id in inventory.areas
         )
-        for area_id in panel.areas
-    )
 
-    entities.extend(
-        AreaReadyToArmSensor(
-            panel, area_id, config_entry.unique_id or config_entry.entry_id, "home"
+        entities.extend(
+            AreaReadyToArmSensor(
+                data, area_id, config_entry.unique_id or config_entry.entry_id, "home"
+            )
+            for area_id in inventory.areas
         )
-        for area_id in panel.areas
-    )
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_add_inventory(PanelInventory.from_panel(data.panel))
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_INVENTORY_ADDED.format(config_entry.entry_id),
+            async_add_inventory,
+        )
+    )
 
 
 PARALLEL_UPDATES = 0
@@ -163,20 +177,27 @@ class PanelFaultsSensor(BoschAlarmEntity, BinarySensorEntity):
 
     def __init__(
         self,
-        panel: Panel,
+        data: BoschAlarmData,
         unique_id: str,
         entity_description: BoschAlarmFaultEntityDescription,
     ) -> None:
         """Set up a binary sensor entity for each fault type in a bosch alarm panel."""
-        super().__init__(panel, unique_id, True)
+        super().__init__(data, unique_id)
         self.entity_description = entity_description
         self._fault_type = entity_description.fault
         self._attr_unique_id = f"{unique_id}_fault_{entity_description.key}"
 
+    async def async_added_to_hass(self) -> None:
+        """Observe state changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._dispatcher.async_add_fault_listener(self._fault_type, self)
+        )
+
     @property
     def is_on(self) -> bool:
         """Return if this fault has occurred."""
-        return self._fault_type in self.panel.panel_faults_ids
+        return bool(self._dispatcher.fault_mask & self._fault_type)
 
 
 class AreaReadyToArmSensor(BoschAlarmAreaEntity, BinarySensorEntity):
@@ -185,11 +206,10 @@ class AreaReadyToArmSensor(BoschAlarmAreaEntity, BinarySensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(
-        self, panel: Panel, area_id: int, unique_id: str, arm_type: str
+        self, data: BoschAlarmData, area_id: int, unique_id: str, arm_type: str
     ) -> None:
         """Set up a binary sensor entity for the arming status in a bosch alarm panel."""
-        super().__init__(panel, area_id, unique_id, False, False, True)
-        self.panel = panel
+        super().__init__(data, area_id, unique_id, False, False, True)
         self._arm_type = arm_type
         self._attr_translation_key = f"area_ready_to_arm_{arm_type}"
         self._attr_unique_id = f"{self._area_unique_id}_ready_to_arm_{arm_type}"
@@ -209,9 +229,9 @@ class PointSensor(BoschAlarmPointEntity, BinarySensorEntity):
 
     _attr_name = None
 
-    def __init__(self, panel: Panel, point_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, point_id: int, unique_id: str) -> None:
         """Set up a binary sensor entity for a point in a bosch alarm panel."""
-        super().__init__(panel, point_id, unique_id)
+        super().__init__(data, point_id, unique_id)
         self._attr_unique_id = self._point_unique_id
 
     @property
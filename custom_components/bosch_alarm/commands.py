@@ -0,0 +1,173 @@
+"""Prioritized command queue for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+import heapq
+import itertools
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .metrics import BoschAlarmMetrics
+
+# How many commands may be in flight to a panel at once
+COMMAND_CONCURRENCY = 4
+
+# Disarming jumps ahead of arming, which jumps ahead of outputs and doors
+PRIORITY_DISARM = 0
+PRIORITY_ARM = 1
+PRIORITY_DEFAULT = 2
+
+# The kinds of panel entity a command can target
+TARGET_AREA = "area"
+TARGET_DOOR = "door"
+TARGET_OUTPUT = "output"
+
+type Command = Callable[..., Coroutine[Any, Any, None]]
+
+
+@dataclass(slots=True)
+class _QueuedCommand:
+    """A command waiting for a slot, and the callers waiting for it."""
+
+    command: Command
+    args: tuple[Any, ...]
+    key: tuple[Any, ...] | None
+    future: asyncio.Future[None]
+    queued: float
+    stop_confirm: CALLBACK_TYPE | None = None
+    replaced: bool = False
+
+
+class BoschAlarmCommandQueue:
+    """Send commands to a panel by priority, a few at a time.
+
+    At most COMMAND_CONCURRENCY commands are in flight at once. Each area,
+    output or door has at most one command waiting for a slot. A newer
+    command for the same target replaces the waiting one, and the callers of
+    the replaced command wait for the newer one instead, so the panel always
+    ends up in the state that was asked for last. A repeat of the waiting
+    command is not queued again. Waiting commands for different targets are
+    sent by priority, then in the order they were queued, so a burst of
+    output toggles cannot hold up a disarm.
+
+    Waiting for the panel to confirm a command starts when it is queued, and
+    stops again if it is replaced or fails, so only commands that are sent
+    are confirmed, once each.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[..., Awaitable[None]],
+        metrics: BoschAlarmMetrics,
+    ) -> None:
+        """Initialise the queue."""
+        self._hass = hass
+        self._send = send
+        self._metrics = metrics
+        self._heap: list[tuple[int, int, _QueuedCommand]] = []
+        self._waiting: dict[tuple[Any, ...], _QueuedCommand] = {}
+        self._order = itertools.count()
+        self.depth = 0
+        self.in_flight = 0
+        self.deduplicated = 0
+        self.replaced = 0
+
+    async def async_command(
+        self,
+        command: Command,
+        *args: Any,
+        target: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
+        confirm: Callable[[], CALLBACK_TYPE] | None = None,
+    ) -> None:
+        """Queue a command and wait until the panel has answered it.
+
+        Commands with the same target kind and arguments act on the same
+        area, output or door. Commands without a target are never merged.
+        If the command is queued, `confirm` is called to start waiting for
+        its confirmation, and the callback it returns stops waiting.
+        """
+        key = (target, *args) if target is not None else None
+        waiting = self._waiting.get(key) if key is not None else None
+        if waiting is not None and (waiting.command, waiting.args) == (command, args):
+            self.deduplicated += 1
+            future = waiting.future
+        else:
+            if waiting is not None:
+                # The callers of the replaced command now wait for this one
+                waiting.replaced = True
+                if waiting.stop_confirm is not None:
+                    waiting.stop_confirm()
+                self.replaced += 1
+                self.depth -= 1
+                future = waiting.future
+                queued_at = waiting.queued
+            else:
+                future = self._hass.loop.create_future()
+                queued_at = time.monotonic()
+            queued = _QueuedCommand(
+                command,
+                args,
+                key,
+                future,
+                queued_at,
+                confirm() if confirm is not None else None,
+            )
+            if key is not None:
+                self._waiting[key] = queued
+            heapq.heappush(self._heap, (priority, next(self._order), queued))
+            self.depth += 1
+            self._async_send_next()
+        # Other callers may be waiting for the same command
+        await asyncio.shield(future)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the commands that are still waiting."""
+        for _, _, queued in self._heap:
+            queued.future.cancel()
+        self._heap.clear()
+        self._waiting.clear()
+        self.depth = 0
+
+    @callback
+    def _async_send_next(self) -> None:
+        """Send waiting commands while there are free slots."""
+        while self._heap and self.in_flight < COMMAND_CONCURRENCY:
+            _, _, queued = heapq.heappop(self._heap)
+            if queued.replaced:
+                continue
+            if queued.key is not None:
+                del self._waiting[queued.key]
+            self.depth -= 1
+            self.in_flight += 1
+            self._metrics.record_command_wait(time.monotonic() - queued.queued)
+            self._hass.async_create_task(
+                self._async_send(queued), f"{DOMAIN}_command", eager_start=False
+            )
+
+    async def _async_send(self, queued: _QueuedCommand) -> None:
+        """Send a command and hand its outcome to the waiting callers."""
+        try:
+            await self._send(queued.command, *queued.args)
+        except asyncio.CancelledError:
+            if queued.stop_confirm is not None:
+                queued.stop_confirm()
+            queued.future.cancel()
+            raise
+        except Exception as err:
+            if queued.stop_confirm is not None:
+                queued.stop_confirm()
+            queued.future.set_exception(err)
+        else:
+            queued.future.set_result(None)
+        finally:
+            self.in_flight -= 1
+            self._async_send_next()
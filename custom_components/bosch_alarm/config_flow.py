@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Mapping
+from ipaddress import ip_network
 import logging
 import ssl
 from typing import Any, Self
@@ -16,8 +17,10 @@ from homeassistant.config_entries import (
     SOURCE_RECONFIGURE,
     SOURCE_USER,
     ConfigEntryState,
+    ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
+    OptionsFlow,
 )
 from homeassistant.const import (
     CONF_CODE,
@@ -26,12 +29,44 @@ from homeassistant.const import (
     CONF_MODEL,
     CONF_PASSWORD,
     CONF_PORT,
+    CONF_TIMEOUT,
 )
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 
-from .const import CONF_INSTALLER_CODE, CONF_USER_CODE, DOMAIN
+from .const import (
+    CONF_CONCURRENCY,
+    CONF_DEVICE_LAYOUT,
+    CONF_HISTORY_SIZE,
+    CONF_INSTALLER_CODE,
+    CONF_NETWORK,
+    CONF_PERSIST_HISTORY,
+    CONF_USER_CODE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_TIMEOUT,
+    DEVICE_LAYOUT_DEVICES,
+    DEVICE_LAYOUT_PANEL,
+    DOMAIN,
+    MAX_SCAN_HOSTS,
+)
+from .discovery import (
+    DhcpProbeResult,
+    DiscoveredPanel,
+    async_get_dhcp_probe_cache,
+    async_scan_network,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +77,19 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NETWORK): str,
+        vol.Required(CONF_PORT, default=7700): cv.positive_int,
+        vol.Required(CONF_CONCURRENCY, default=DEFAULT_SCAN_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1024)
+        ),
+        vol.Required(CONF_TIMEOUT, default=DEFAULT_SCAN_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5, max=60)
+        ),
+    }
+)
+
 STEP_AUTH_DATA_SCHEMA_SOLUTION = vol.Schema(
     {
         vol.Required(CONF_USER_CODE): str,
@@ -63,6 +111,27 @@ STEP_AUTH_DATA_SCHEMA_BG = vol.Schema(
 
 STEP_INIT_DATA_SCHEMA = vol.Schema({vol.Optional(CONF_CODE): str})
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DEVICE_LAYOUT, default=DEVICE_LAYOUT_DEVICES): SelectSelector(
+            SelectSelectorConfig(
+                options=[DEVICE_LAYOUT_DEVICES, DEVICE_LAYOUT_PANEL],
+                mode=SelectSelectorMode.LIST,
+                translation_key=CONF_DEVICE_LAYOUT,
+            )
+        ),
+        vol.Required(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): vol.All(
+            NumberSelector(
+                NumberSelectorConfig(
+                    min=100, max=10000, step=100, mode=NumberSelectorMode.BOX
+                )
+            ),
+            vol.Coerce(int),
+        ),
+        vol.Required(CONF_PERSIST_HISTORY, default=False): BooleanSelector(),
+    }
+)
+
 
 async def try_connect(
     data: dict[str, Any], load_selector: int = 0
@@ -95,9 +164,24 @@ class BoschAlarmConfigFlow(ConfigFlow, domain=DOMAIN):
         """Init config flow."""
 
         self._data: dict[str, Any] = {}
+        self._discovered: dict[str, DiscoveredPanel] = {}
+        self._scan_task: asyncio.Task[list[DiscoveredPanel]] | None = None
+        self._scan_error: str | None = None
         self.mac: str | None = None
         self.host: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> BoschAlarmOptionsFlow:
+        """Create the options flow."""
+        return BoschAlarmOptionsFlow()
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop a network scan that is still running."""
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+
     def is_matching(self, other_flow: Self) -> bool:
         """Return True if other_flow is matching this flow."""
         return self.mac == other_flow.mac or self.host == other_flow.host
@@ -109,6 +193,13 @@ class BoschAlarmConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            if self.source == SOURCE_USER and "/" in user_input[CONF_HOST]:
+                # A network was entered instead of a host, so offer to scan it
+                self._data = {
+                    CONF_NETWORK: user_input[CONF_HOST],
+                    CONF_PORT: user_input[CONF_PORT],
+                }
+                return await self.async_step_scan()
             self.host = user_input[CONF_HOST]
             if self.source == SOURCE_USER:
                 self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
@@ -145,6 +236,99 @@ class BoschAlarmConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle scanning a network for panels."""
+        errors: dict[str, str] = {}
+        if self._scan_error is not None:
+            errors["base"], self._scan_error = self._scan_error, None
+
+        if user_input is not None:
+            try:
+                network = ip_network(user_input[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if network.num_addresses > MAX_SCAN_HOSTS:
+                    errors[CONF_NETWORK] = "network_too_large"
+                else:
+                    self._data = user_input
+                    # A large network can take minutes to scan
+                    self._scan_task = self.hass.async_create_task(
+                        async_scan_network(
+                            network,
+                            user_input[CONF_PORT],
+                            user_input[CONF_CONCURRENCY],
+                            user_input[CONF_TIMEOUT],
+                        ),
+                        f"{DOMAIN}_scan_network",
+                    )
+                    return await self.async_step_scan_progress()
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_SCAN_DATA_SCHEMA, user_input or self._data
+            ),
+            errors=errors,
+        )
+
+    async def async_step_scan_progress(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show the progress of a network scan until it has finished."""
+        assert self._scan_task is not None
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan",
+                description_placeholders={CONF_NETWORK: self._data[CONF_NETWORK]},
+                progress_task=self._scan_task,
+            )
+
+        scan, self._scan_task = self._scan_task, None
+        configured = {
+            entry.data[CONF_HOST]
+            for entry in self._async_current_entries(include_ignore=False)
+        }
+        self._discovered = {
+            panel.host: panel for panel in scan.result() if panel.host not in configured
+        }
+        if self._discovered:
+            return self.async_show_progress_done(next_step_id="scan_select")
+        self._scan_error = "no_panels_found"
+        return self.async_show_progress_done(next_step_id="scan")
+
+    async def async_step_scan_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle choosing one of the panels found by a scan."""
+        if user_input is not None:
+            panel = self._discovered[user_input[CONF_HOST]]
+            self.host = panel.host
+            self._async_abort_entries_match({CONF_HOST: panel.host})
+            self._data = {
+                CONF_HOST: panel.host,
+                CONF_PORT: panel.port,
+                CONF_MODEL: panel.model,
+            }
+            return await self.async_step_auth()
+
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(
+                        {
+                            host: f"{panel.model} ({host})"
+                            for host, panel in self._discovered.items()
+                        }
+                    )
+                }
+            ),
+        )
+
     async def async_step_dhcp(
         self, discovery_info: DhcpServiceInfo
     ) -> ConfigFlowResult:
@@ -181,21 +365,29 @@ class BoschAlarmConfigFlow(ConfigFlow, domain=DOMAIN):
                     if result:
                         self.hass.config_entries.async_schedule_reload(entry.entry_id)
                 return self.async_abort(reason="already_configured")
-        try:
-            # Use load_selector = 0 to fetch the panel model without authentication.
-            (model, _) = await try_connect(
-                {CONF_HOST: discovery_info.ip, CONF_PORT: 7700}, 0
-            )
-        except (
-            OSError,
-            ConnectionRefusedError,
-            ssl.SSLError,
-            asyncio.exceptions.TimeoutError,
-        ):
-            return self.async_abort(reason="cannot_connect")
-        except Exception:
-            _LOGGER.exception("Unexpected exception")
-            return self.async_abort(reason="unknown")
+        cache = async_get_dhcp_probe_cache(self.hass)
+        if (probe := cache.get(self.mac, discovery_info.ip)) is None:
+            try:
+                # Use load_selector = 0 to fetch the panel model without authentication.
+                (model, _) = await try_connect(
+                    {CONF_HOST: discovery_info.ip, CONF_PORT: 7700}, 0
+                )
+            except (
+                OSError,
+                ConnectionRefusedError,
+                ssl.SSLError,
+                asyncio.exceptions.TimeoutError,
+            ):
+                probe = DhcpProbeResult(discovery_info.ip, error="cannot_connect")
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                probe = DhcpProbeResult(discovery_info.ip, error="unknown")
+            else:
+                probe = DhcpProbeResult(discovery_info.ip, model=model)
+            cache.set(self.mac, probe)
+        if probe.error:
+            return self.async_abort(reason=probe.error)
+        model = probe.model
         self.context["title_placeholders"] = {
             "model": model,
             "host": discovery_info.ip,
@@ -327,3 +519,21 @@ class BoschAlarmConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=self.add_suggested_values_to_schema(schema, user_input),
             errors=errors,
         )
+
+
+class BoschAlarmOptionsFlow(OptionsFlow):
+    """Handle the options of a Bosch Alarm config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
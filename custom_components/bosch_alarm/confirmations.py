@@ -0,0 +1,128 @@
+"""Confirmation of the commands sent to a Bosch Alarm panel."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import time
+from typing import Any
+
+from bosch_alarm_mode2.panel import Area, Output
+from bosch_alarm_mode2.utils import Observable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .profiler import BoschAlarmProfiler
+
+# How long the panel may take to report the state a command asked for
+CONFIRMATION_TIMEOUT = 30
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+CONFIRMATION_BOUNDS_MS = (10.0, 50.0, 100.0, 500.0, 1000.0, 5000.0)
+
+
+@dataclass(frozen=True, slots=True)
+class ExpectedState:
+    """The state a command should put an area, output or door in."""
+
+    observable: Observable
+    reached: Callable[[], bool]
+
+
+def area_armed(area: Area, away: bool) -> ExpectedState:
+    """Return the expected state of an area that is armed away or home."""
+    armed = area.is_all_armed if away else area.is_part_armed
+    # Exit delays can be long, so arming counts as confirmation
+    return ExpectedState(area.status_observer, lambda: area.is_arming() or armed())
+
+
+def area_disarmed(area: Area) -> ExpectedState:
+    """Return the expected state of an area that is disarmed."""
+    return ExpectedState(area.status_observer, area.is_disarmed)
+
+
+def output_active(output: Output, active: bool) -> ExpectedState:
+    """Return the expected state of an output that is turned on or off."""
+    return ExpectedState(output.status_observer, lambda: output.is_active() == active)
+
+
+class BoschAlarmConfirmations:
+    """Time how long the panel takes to confirm the commands sent to it.
+
+    A waiter is attached to the observable of the target of a command when
+    the command is queued. It resolves on the first status update that shows
+    the expected state, and the time since the command was queued is
+    recorded by command type. Waiters that are not resolved within
+    CONFIRMATION_TIMEOUT seconds are counted as timed out instead.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise the confirmation tracking."""
+        self._hass = hass
+        self._latency = BoschAlarmProfiler(CONFIRMATION_BOUNDS_MS)
+        self._waiters: set[CALLBACK_TYPE] = set()
+        self.timeouts: dict[str, int] = {}
+
+    @property
+    def pending(self) -> int:
+        """Return the number of commands waiting for confirmation.
+
+        Each of them has a callback attached to the observable of its target.
+        """
+        return len(self._waiters)
+
+    def mean_latency(self, *names: str) -> float | None:
+        """Return the mean confirmation latency of command types in seconds."""
+        return self._latency.mean(*names)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the confirmation latency histograms and timeouts."""
+        return {
+            "pending": self.pending,
+            "latency": self._latency.as_dict(),
+            "timeouts": dict(sorted(self.timeouts.items())),
+        }
+
+    @callback
+    def async_expect(self, name: str, expected: ExpectedState) -> CALLBACK_TYPE:
+        """Wait for a command to be confirmed, and return a callback to stop."""
+        if expected.reached():
+            # Nothing to confirm if the target is already in the expected state
+            return lambda: None
+        start = time.monotonic()
+
+        @callback
+        def async_check() -> None:
+            if async_stop in self._waiters and expected.reached():
+                self._latency.record(name, time.monotonic() - start)
+                async_stop()
+
+        @callback
+        def async_timed_out(_now: datetime) -> None:
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+            async_stop()
+
+        cancel_timeout = async_call_later(
+            self._hass, CONFIRMATION_TIMEOUT, async_timed_out
+        )
+
+        @callback
+        def async_stop() -> None:
+            if async_stop not in self._waiters:
+                return
+            self._waiters.discard(async_stop)
+            cancel_timeout()
+            # Observers can't be detached while the observable notifies them
+            self._hass.loop.call_soon(expected.observable.detach, async_check)
+
+        expected.observable.attach(async_check)
+        self._waiters.add(async_stop)
+        return async_stop
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop waiting for any command to be confirmed."""
+        for async_stop in list(self._waiters):
+            async_stop()
@@ -1,9 +1,58 @@
 """Constants for the Bosch Alarm integration."""
 
+from bosch_alarm_mode2.const import ALARM_MEMORY_PRIORITIES
+
 DOMAIN = "bosch_alarm"
+MANUFACTURER = "Bosch Security Systems"
 HISTORY_ATTR = "history"
+EVENT_HISTORY = f"{DOMAIN}_{HISTORY_ATTR}"
 CONF_INSTALLER_CODE = "installer_code"
 CONF_USER_CODE = "user_code"
+CONF_NETWORK = "network"
+CONF_CONCURRENCY = "concurrency"
+CONF_DEVICE_LAYOUT = "device_layout"
+DEVICE_LAYOUT_DEVICES = "devices"
+DEVICE_LAYOUT_PANEL = "panel"
+CONF_HISTORY_SIZE = "history_size"
+CONF_PERSIST_HISTORY = "persist_history"
+DEFAULT_HISTORY_SIZE = 1000
 DATETIME_ATTR = "datetime"
 SET_DATE_TIME_SERVICE_NAME = "set_date_time"
+DURATION_ATTR = "duration"
+CPROFILE_ATTR = "cprofile"
+PROFILE_SERVICE_NAME = "profile"
+AFTER_ID_ATTR = "after_id"
+LIMIT_ATTR = "limit"
+GET_HISTORY_SERVICE_NAME = "get_history"
+AREAS_ATTR = "areas"
+MODE_ATTR = "mode"
+ARM_MODE_AWAY = "away"
+ARM_MODE_HOME = "home"
+ARM_AREAS_SERVICE_NAME = "arm_areas"
+DISARM_AREAS_SERVICE_NAME = "disarm_areas"
+OUTPUTS_ATTR = "outputs"
+SET_OUTPUTS_SERVICE_NAME = "set_outputs"
 ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+DEFAULT_SCAN_CONCURRENCY = 128
+DEFAULT_SCAN_TIMEOUT = 5.0
+MAX_SCAN_HOSTS = 4096
+SIGNAL_INVENTORY_ADDED = f"{DOMAIN}_inventory_added_{{}}"
+SIGNAL_INVENTORY_RENAMED = f"{DOMAIN}_inventory_renamed_{{}}"
+
+ALARM_TYPES = {
+    "burglary": {
+        ALARM_MEMORY_PRIORITIES.BURGLARY_SUPERVISORY: "supervisory",
+        ALARM_MEMORY_PRIORITIES.BURGLARY_TROUBLE: "trouble",
+        ALARM_MEMORY_PRIORITIES.BURGLARY_ALARM: "alarm",
+    },
+    "gas": {
+        ALARM_MEMORY_PRIORITIES.GAS_SUPERVISORY: "supervisory",
+        ALARM_MEMORY_PRIORITIES.GAS_TROUBLE: "trouble",
+        ALARM_MEMORY_PRIORITIES.GAS_ALARM: "alarm",
+    },
+    "fire": {
+        ALARM_MEMORY_PRIORITIES.FIRE_SUPERVISORY: "supervisory",
+        ALARM_MEMORY_PRIORITIES.FIRE_TROUBLE: "trouble",
+        ALARM_MEMORY_PRIORITIES.FIRE_ALARM: "alarm",
+    },
+}
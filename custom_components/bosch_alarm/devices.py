@@ -0,0 +1,167 @@
+"""Device info shared by the entities of a Bosch Alarm panel."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from bosch_alarm_mode2 import Panel
+from bosch_alarm_mode2.panel import PanelEntity
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntry, DeviceInfo
+
+from .const import DEVICE_LAYOUT_DEVICES, DEVICE_LAYOUT_PANEL, DOMAIN, MANUFACTURER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BoschAlarmDevices:
+    """Build the device info of each device of a panel once.
+
+    Every entity attached to the same device shares one DeviceInfo object, so
+    the alarm panel, ready sensors and alarm sensors of an area do not each
+    build their own.
+
+    With the panel layout, points, doors and outputs do not get devices of
+    their own and their entities are attached to the panel device instead.
+    """
+
+    def __init__(
+        self, panel: Panel, unique_id: str, layout: str = DEVICE_LAYOUT_DEVICES
+    ) -> None:
+        """Initialise the device info cache."""
+        self._panel = panel
+        self.unique_id = unique_id
+        self.flat = layout == DEVICE_LAYOUT_PANEL
+        self._device_info: dict[str, DeviceInfo] = {}
+
+    @property
+    def panel(self) -> DeviceInfo:
+        """Return the device info of the panel itself."""
+        if (device_info := self._device_info.get(self.unique_id)) is None:
+            device_info = self._device_info[self.unique_id] = DeviceInfo(
+                identifiers={(DOMAIN, self.unique_id)},
+                name=f"Bosch {self._panel.model}",
+                manufacturer=MANUFACTURER,
+            )
+        return device_info
+
+    def area(self, area_id: int) -> DeviceInfo:
+        """Return the device info of an area."""
+        return self._child("area", area_id, self._panel.areas[area_id])
+
+    def point(self, point_id: int) -> DeviceInfo:
+        """Return the device info of a point."""
+        if self.flat:
+            return self.panel
+        return self._child("point", point_id, self._panel.points[point_id])
+
+    def door(self, door_id: int) -> DeviceInfo:
+        """Return the device info of a door."""
+        if self.flat:
+            return self.panel
+        return self._child("door", door_id, self._panel.doors[door_id])
+
+    def output(self, output_id: int) -> DeviceInfo:
+        """Return the device info of an output."""
+        if self.flat:
+            return self.panel
+        return self._child("output", output_id, self._panel.outputs[output_id])
+
+    @callback
+    def async_provision(self, hass: HomeAssistant, config_entry_id: str) -> int:
+        """Create the devices of every area, point, door and output in one pass.
+
+        Devices that already exist with the same name, parent and config entry
+        are left alone, so the registry is only written to for new or changed
+        devices. With the panel layout, devices left over from the per device
+        layout are removed instead. Returns the number of devices created,
+        updated or removed.
+        """
+        start = time.perf_counter()
+        device_registry = dr.async_get(hass)
+        panel_device = device_registry.async_get_device({(DOMAIN, self.unique_id)})
+        via_device_id = panel_device.id if panel_device else None
+        children: list[tuple[str, dict[int, PanelEntity], bool]] = [
+            ("area", self._panel.areas, False),
+            ("point", self._panel.points, self.flat),
+            ("door", self._panel.doors, self.flat),
+            ("output", self._panel.outputs, self.flat),
+        ]
+        stale: list[DeviceEntry] = []
+        provisioned = 0
+        for prefix, entities, flat in children:
+            for id, entity in entities.items():
+                identifier = f"{self.unique_id}_{prefix}_{id}"
+                device = device_registry.async_get_device({(DOMAIN, identifier)})
+                if flat:
+                    if device is not None:
+                        stale.append(device)
+                    continue
+                device_info = self._child(prefix, id, entity)
+                if (
+                    device is not None
+                    and device.name == device_info["name"]
+                    and device.via_device_id == via_device_id
+                    and config_entry_id in device.config_entries
+                ):
+                    continue
+                device_registry.async_get_or_create(
+                    config_entry_id=config_entry_id, **device_info
+                )
+                provisioned += 1
+        if stale and panel_device:
+            self._async_flatten(hass, config_entry_id, panel_device, stale)
+            provisioned += len(stale)
+        _LOGGER.debug(
+            "Provisioned %d devices in %.3fs",
+            provisioned,
+            time.perf_counter() - start,
+        )
+        return provisioned
+
+    @callback
+    def async_forget(self, prefix: str, id: int) -> None:
+        """Drop the cached device info of a renamed or removed device."""
+        self._device_info.pop(f"{self.unique_id}_{prefix}_{id}", None)
+
+    def _child(self, prefix: str, id: int, entity: PanelEntity) -> DeviceInfo:
+        """Return the device info of a device attached to the panel."""
+        identifier = f"{self.unique_id}_{prefix}_{id}"
+        if (device_info := self._device_info.get(identifier)) is None:
+            device_info = self._device_info[identifier] = DeviceInfo(
+                identifiers={(DOMAIN, identifier)},
+                name=entity.name,
+                manufacturer=MANUFACTURER,
+                via_device=(DOMAIN, self.unique_id),
+            )
+        return device_info
+
+    @callback
+    def _async_flatten(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        panel_device: DeviceEntry,
+        stale: list[DeviceEntry],
+    ) -> None:
+        """Move the entities of stale devices to the panel and remove the devices.
+
+        Entities are moved first, as removing a device removes its entities.
+        """
+        entity_registry = er.async_get(hass)
+        stale_ids = {device.id for device in stale}
+        for entity_entry in er.async_entries_for_config_entry(
+            entity_registry, config_entry_id
+        ):
+            if entity_entry.device_id in stale_ids:
+                entity_registry.async_update_entity(
+                    entity_entry.entity_id, device_id=panel_device.id
+                )
+        device_registry = dr.async_get(hass)
+        for device in stale:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=config_entry_id
+            )
@@ -2,72 +2,104 @@
 
 from typing import Any
 
+from bosch_alarm_mode2 import Panel
+
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.const import CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 from .const import CONF_INSTALLER_CODE, CONF_USER_CODE
+from .discovery import async_get_dhcp_probe_cache
+from .startup import async_get_startup_scheduler
 from .types import BoschAlarmConfigEntry
 
 TO_REDACT = [CONF_INSTALLER_CODE, CONF_USER_CODE, CONF_PASSWORD]
 
+# The full history is available from the get_history service
+HISTORY_LIMIT = 100
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: BoschAlarmConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    panel = entry.runtime_data.panel
+    dispatcher = entry.runtime_data.dispatcher
+
+    # The panel is changed by the event loop, so its state is read there
+    data = _async_panel_data(panel)
+    data["history_events_total"] = len(panel.events)
 
     return {
         "entry_data": async_redact_data(entry.data, TO_REDACT),
-        "data": {
-            "model": entry.runtime_data.model,
-            "serial_number": entry.runtime_data.serial_number,
-            "protocol_version": entry.runtime_data.protocol_version,
-            "firmware_version": entry.runtime_data.firmware_version,
-            "areas": [
-                {
-                    "id": area_id,
-                    "name": area.name,
-                    "all_ready": area.all_ready,
-                    "part_ready": area.part_ready,
-                    "faults": area.faults,
-                    "alarms": area.alarms,
-                    "disarmed": area.is_disarmed(),
-                    "arming": area.is_arming(),
-                    "pending": area.is_pending(),
-                    "part_armed": area.is_part_armed(),
-                    "all_armed": area.is_all_armed(),
-                    "armed": area.is_armed(),
-                    "triggered": area.is_triggered(),
-                }
-                for area_id, area in entry.runtime_data.areas.items()
-            ],
-            "points": [
-                {
-                    "id": point_id,
-                    "name": point.name,
-                    "open": point.is_open(),
-                    "normal": point.is_normal(),
-                }
-                for point_id, point in entry.runtime_data.points.items()
-            ],
-            "doors": [
-                {
-                    "id": door_id,
-                    "name": door.name,
-                    "open": door.is_open(),
-                    "locked": door.is_locked(),
-                }
-                for door_id, door in entry.runtime_data.doors.items()
-            ],
-            "outputs": [
-                {
-                    "id": output_id,
-                    "name": output.name,
-                    "active": output.is_active(),
-                }
-                for output_id, output in entry.runtime_data.outputs.items()
-            ],
-            "history_events": entry.runtime_data.events,
+        "data": data,
+        "commands": {
+            "queued": dispatcher.commands.depth,
+            "in_flight": dispatcher.commands.in_flight,
+            "deduplicated": dispatcher.commands.deduplicated,
+            "replaced": dispatcher.commands.replaced,
+        },
+        "confirmations": dispatcher.confirmations.as_dict(),
+        "state_writes": {
+            "written": dispatcher.state_writes,
+            "suppressed": dispatcher.suppressed_writes,
         },
+        "dhcp_probe_cache": async_get_dhcp_probe_cache(hass).as_dict(),
+        "startup": async_get_startup_scheduler(hass).as_dict(entry.entry_id),
+    }
+
+
+@callback
+def _async_panel_data(panel: Panel) -> dict[str, Any]:
+    """Return the state of a panel and its most recent history."""
+    return {
+        "model": panel.model,
+        "serial_number": panel.serial_number,
+        "protocol_version": panel.protocol_version,
+        "firmware_version": panel.firmware_version,
+        "areas": [
+            {
+                "id": area_id,
+                "name": area.name,
+                "all_ready": area.all_ready,
+                "part_ready": area.part_ready,
+                "faults": area.faults,
+                "alarms": area.alarms,
+                "disarmed": area.is_disarmed(),
+                "arming": area.is_arming(),
+                "pending": area.is_pending(),
+                "part_armed": area.is_part_armed(),
+                "all_armed": area.is_all_armed(),
+                "armed": area.is_armed(),
+                "triggered": area.is_triggered(),
+            }
+            for area_id, area in panel.areas.items()
+        ],
+        "points": [
+            {
+                "id": point_id,
+                "name": point.name,
+                "open": point.is_open(),
+                "normal": point.is_normal(),
+            }
+            for point_id, point in panel.points.items()
+        ],
+        "doors": [
+            {
+                "id": door_id,
+                "name": door.name,
+                "open": door.is_open(),
+                "locked": door.is_locked(),
+            }
+            for door_id, door in panel.doors.items()
+        ],
+        "outputs": [
+            {
+                "id": output_id,
+                "name": output.name,
+                "active": output.is_active(),
+            }
+            for output_id, output in panel.outputs.items()
+        ],
+        "history_events": panel.events[-HISTORY_LIMIT:],
     }
@@ -0,0 +1,139 @@
+"""Network discovery for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from ipaddress import IPv4Network, IPv6Network
+import logging
+import ssl
+import time
+
+from bosch_alarm_mode2 import Panel
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+DHCP_PROBE_TTL = 300
+DHCP_PROBE_CACHE_SIZE = 64
+
+DATA_DHCP_PROBE_CACHE: HassKey[DhcpProbeCache] = HassKey(f"{DOMAIN}_dhcp_probe_cache")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredPanel:
+    """A panel that answered a probe."""
+
+    host: str
+    port: int
+    model: str
+
+
+async def async_probe_panel(host: str, port: int, timeout: float) -> DiscoveredPanel:
+    """Fetch the model of a panel without authenticating."""
+    panel = Panel(
+        host=host, port=port, automation_code=None, installer_or_user_code=None
+    )
+    try:
+        async with asyncio.timeout(timeout):
+            # Use load_selector = 0 to fetch the panel model without authentication.
+            await panel.connect(0)
+    finally:
+        await panel.disconnect()
+    return DiscoveredPanel(host, port, panel.model)
+
+
+async def async_scan_network(
+    network: IPv4Network | IPv6Network,
+    port: int,
+    concurrency: int,
+    timeout: float,
+) -> list[DiscoveredPanel]:
+    """Probe every host of a network for a panel.
+
+    At most `concurrency` hosts are probed at once, and each probe is abandoned
+    after `timeout` seconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> DiscoveredPanel | None:
+        async with semaphore:
+            try:
+                return await async_probe_panel(host, port, timeout)
+            except (OSError, ssl.SSLError, TimeoutError):
+                return None
+            except Exception:
+                _LOGGER.exception("Unexpected exception probing %s", host)
+                return None
+
+    results = await asyncio.gather(*(probe(str(host)) for host in network.hosts()))
+    return [panel for panel in results if panel is not None]
+
+
+@dataclass(frozen=True)
+class DhcpProbeResult:
+    """The outcome of probing a host announced over DHCP."""
+
+    host: str
+    model: str | None = None
+    error: str | None = None
+
+
+class DhcpProbeCache:
+    """Remember the outcome of DHCP probes per MAC address for a limited time.
+
+    Repeated announcements for the same MAC and IP address are answered from
+    the cache instead of probing the panel again. The least recently used
+    entries are evicted once the cache is full.
+    """
+
+    def __init__(
+        self, ttl: float = DHCP_PROBE_TTL, max_size: int = DHCP_PROBE_CACHE_SIZE
+    ) -> None:
+        """Initialise the cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, DhcpProbeResult]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached probe results."""
+        return len(self._entries)
+
+    def get(self, mac: str, host: str) -> DhcpProbeResult | None:
+        """Return the cached result of probing a MAC address at a host."""
+        if (entry := self._entries.get(mac)) is not None:
+            expires, result = entry
+            if expires <= time.monotonic() or result.host != host:
+                del self._entries[mac]
+            else:
+                self._entries.move_to_end(mac)
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def set(self, mac: str, result: DhcpProbeResult) -> None:
+        """Cache the result of probing a MAC address."""
+        self._entries[mac] = (time.monotonic() + self._ttl, result)
+        self._entries.move_to_end(mac)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the cache statistics."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+@callback
+def async_get_dhcp_probe_cache(hass: HomeAssistant) -> DhcpProbeCache:
+    """Return the DHCP probe cache shared by all discovery flows."""
+    if (cache := hass.data.get(DATA_DHCP_PROBE_CACHE)) is None:
+        cache = hass.data[DATA_DHCP_PROBE_CACHE] = DhcpProbeCache()
+    return cache
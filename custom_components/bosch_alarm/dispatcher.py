@@ -0,0 +1,348 @@
+"""Coalescing state update dispatcher for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+import time
+from typing import TYPE_CHECKING, Any
+
+from bosch_alarm_mode2 import Panel
+from bosch_alarm_mode2.panel import Area
+from bosch_alarm_mode2.utils import Observable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .commands import PRIORITY_DEFAULT, BoschAlarmCommandQueue, Command
+from .confirmations import BoschAlarmConfirmations, ExpectedState
+from .const import ALARM_TYPES
+from .metrics import BoschAlarmMetrics
+from .profiler import BoschAlarmProfiler
+
+if TYPE_CHECKING:
+    from .entity import BoschAlarmEntity
+
+# How long a dropped connection may be down before entities become unavailable
+RECONNECT_GRACE = 15
+
+
+class BoschAlarmDispatcher:
+    """Fan panel observer callbacks out to entities in batched state writes.
+
+    Each observable is attached to once, no matter how many entities listen to it.
+    Entities touched by observer callbacks are collected and written in a single
+    pass on the next iteration of the event loop. Entities whose state and
+    availability are unchanged since their last write are skipped.
+
+    The connection status of the panel is observed once and cached in
+    `available`; every entity is only queued when that flag flips. A dropped
+    connection only clears the flag once it has been down for RECONNECT_GRACE
+    seconds, and writes are held in the meantime. If the panel is back before
+    then, no entity changes availability, and once it has reloaded its status
+    only the entities whose state differs from what they last wrote before the
+    drop are written. Panel faults are likewise folded into `fault_mask`, and
+    only the entities listening to a fault bit that flipped are queued. The
+    alarms of each area are ranked once per alarm update and shared by that
+    area's alarm sensors.
+
+    Commands are sent through the prioritized queue in `commands`, and the
+    time the panel takes to confirm them is tracked in `confirmations`. Push
+    events, state write latency, reconnects, command queue waits and command
+    round trips are recorded in `metrics` along the way. While a profile is
+    running, the time spent in each of these is also recorded in `profiler`.
+    """
+
+    def __init__(self, hass: HomeAssistant, panel: Panel) -> None:
+        """Initialise the dispatcher."""
+        self._hass = hass
+        self._panel = panel
+        self.available = self._connected = panel.connection_status()
+        self._was_connected = self._connected
+        self._grace: CALLBACK_TYPE | None = None
+        self._held = False
+        self.metrics = BoschAlarmMetrics()
+        self.profiler: BoschAlarmProfiler | None = None
+        self.confirmations = BoschAlarmConfirmations(hass)
+        self.commands = BoschAlarmCommandQueue(
+            hass, self._async_send_command, self.metrics
+        )
+        self._entities: set[BoschAlarmEntity] = set()
+        self.fault_mask = self._fault_mask()
+        self._fault_listeners: dict[int, set[BoschAlarmEntity]] = {}
+        self._alarm_index: dict[Observable, dict[str, str]] = {}
+        self._listeners: dict[Observable, set[BoschAlarmEntity]] = {}
+        self._observers: dict[Observable, Callable[[], None]] = {}
+        self._dirty: set[BoschAlarmEntity] = set()
+        self._flush_handle: asyncio.Handle | None = None
+        self._dirty_since: float | None = None
+        self.state_writes = 0
+        self.suppressed_writes = 0
+        panel.connection_status_observer.attach(self._async_connection_status_changed)
+        panel.faults_observer.attach(self._async_faults_changed)
+
+    @callback
+    def async_add_entity(self, entity: BoschAlarmEntity) -> CALLBACK_TYPE:
+        """Write the state of an entity whenever the panel availability flips."""
+        self._entities.add(entity)
+
+        @callback
+        def remove_entity() -> None:
+            self._entities.discard(entity)
+            self._dirty.discard(entity)
+
+        return remove_entity
+
+    @callback
+    def async_add_fault_listener(
+        self, fault: int, entity: BoschAlarmEntity
+    ) -> CALLBACK_TYPE:
+        """Write the state of an entity whenever a panel fault bit flips."""
+        listeners = self._fault_listeners.setdefault(fault, set())
+        listeners.add(entity)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.discard(entity)
+            self._dirty.discard(entity)
+
+        return remove_listener
+
+    @callback
+    def async_add_listener(
+        self, observable: Observable, entity: BoschAlarmEntity
+    ) -> CALLBACK_TYPE:
+        """Write the state of an entity whenever an observable fires."""
+        if (listeners := self._listeners.get(observable)) is None:
+            listeners = self._listeners[observable] = set()
+            observer = self._observers[observable] = partial(
+                self._async_mark_dirty, observable
+            )
+            observable.attach(observer)
+        listeners.add(entity)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.discard(entity)
+            self._dirty.discard(entity)
+            if not listeners and self._listeners.get(observable) is listeners:
+                del self._listeners[observable]
+                observable.detach(self._observers.pop(observable))
+                self._alarm_index.pop(observable, None)
+
+        return remove_listener
+
+    @property
+    def observer_count(self) -> int:
+        """Return the number of callbacks the dispatcher attached to the panel."""
+        # The connection status and faults observers are always attached
+        return len(self._observers) + self.confirmations.pending + 2
+
+    async def async_command(
+        self,
+        command: Command,
+        *args: Any,
+        target: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
+        expect: ExpectedState | None = None,
+    ) -> None:
+        """Queue a command to the panel and wait until it has been answered.
+
+        If the state the command should lead to is given, the time until the
+        panel reports that state is recorded in `confirmations`.
+        """
+        await self.commands.async_command(
+            command,
+            *args,
+            target=target,
+            priority=priority,
+            confirm=(
+                partial(self.confirmations.async_expect, command.__name__, expect)
+                if expect is not None
+                else None
+            ),
+        )
+
+    async def _async_send_command(self, command: Command, *args: Any) -> None:
+        """Send a command to the panel and record its round trip time."""
+        start = time.monotonic()
+        await command(*args)
+        elapsed = time.monotonic() - start
+        self.metrics.record_command(elapsed)
+        if self.profiler is not None:
+            self.profiler.record(f"command.{command.__qualname__}", elapsed)
+
+    def alarm_index(self, area: Area) -> dict[str, str]:
+        """Return the highest active priority of each alarm type for an area.
+
+        The index is kept until the next alarm update while entities listen to
+        the alarms of the area, so they share it.
+        """
+        if (index := self._alarm_index.get(area.alarm_observer)) is None:
+            alarms = set(area.alarms_ids)
+            index = {
+                alarm_type: next(
+                    (key for priority, key in priorities.items() if priority in alarms),
+                    "no_issues",
+                )
+                for alarm_type, priorities in ALARM_TYPES.items()
+            }
+            if area.alarm_observer in self._listeners:
+                self._alarm_index[area.alarm_observer] = index
+        return index
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Detach from all observables and drop any pending writes and commands."""
+        self.commands.async_shutdown()
+        self.confirmations.async_shutdown()
+        if self._grace:
+            self._grace()
+            self._grace = None
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._panel.connection_status_observer.detach(
+            self._async_connection_status_changed
+        )
+        self._panel.faults_observer.detach(self._async_faults_changed)
+        for observable, observer in self._observers.items():
+            observable.detach(observer)
+        self._alarm_index.clear()
+        self._observers.clear()
+        self._listeners.clear()
+        self._entities.clear()
+        self._fault_listeners.clear()
+        self._dirty.clear()
+
+    def _fault_mask(self) -> int:
+        """Return the active panel faults as a bitmask."""
+        mask = 0
+        for fault in self._panel.panel_faults_ids:
+            mask |= fault
+        return mask
+
+    @callback
+    def _async_connection_status_changed(self) -> None:
+        """Queue every entity if the availability of the panel flipped."""
+        start = time.perf_counter()
+        if (connected := self._panel.connection_status()) != self._connected:
+            self._connected = connected
+            if connected:
+                if self._was_connected:
+                    self.metrics.reconnects += 1
+                self._was_connected = True
+                if self._grace:
+                    self._grace()
+                    self._grace = None
+                    # Write the entities that changed while the link was down
+                    self._async_schedule_flush()
+                self._async_set_available(True)
+            elif self.available and self._grace is None:
+                self._grace = async_call_later(
+                    self._hass, RECONNECT_GRACE, self._async_grace_expired
+                )
+        if self.profiler is not None:
+            self.profiler.record("callback.connection", time.perf_counter() - start)
+
+    @callback
+    def _async_grace_expired(self, _now: datetime) -> None:
+        """Mark the entities unavailable once the panel stayed disconnected."""
+        self._grace = None
+        self._async_set_available(False)
+
+    @callback
+    def async_hold_availability(self) -> CALLBACK_TYPE:
+        """Keep the entities unavailable until the returned callback is called.
+
+        The panel reports itself connected before its status has been loaded,
+        which would otherwise show the entities with their default state.
+        """
+        self._held = True
+
+        @callback
+        def release() -> None:
+            self._held = False
+            if self._connected:
+                self._async_set_available(True)
+
+        return release
+
+    @callback
+    def _async_set_available(self, available: bool) -> None:
+        """Queue every entity if the availability of the panel flipped."""
+        if available == self.available or (available and self._held):
+            return
+        self.available = available
+        self._dirty.update(self._entities)
+        self._async_schedule_flush()
+
+    @callback
+    def _async_faults_changed(self) -> None:
+        """Queue the entities of every fault bit that flipped."""
+        start = time.perf_counter()
+        self.metrics.record_event(time.monotonic())
+        mask = self._fault_mask()
+        if flipped := mask ^ self.fault_mask:
+            self.fault_mask = mask
+            for fault, listeners in self._fault_listeners.items():
+                if fault & flipped:
+                    self._dirty.update(listeners)
+            self._async_schedule_flush()
+        if self.profiler is not None:
+            self.profiler.record("callback.faults", time.perf_counter() - start)
+
+    @callback
+    def _async_mark_dirty(self, observable: Observable) -> None:
+        """Queue the listeners of an observable for the next flush."""
+        start = time.perf_counter()
+        self.metrics.record_event(time.monotonic())
+        self._alarm_index.pop(observable, None)
+        self._dirty.update(self._listeners.get(observable, ()))
+        self._async_schedule_flush()
+        if self.profiler is not None:
+            self.profiler.record("callback.observer", time.perf_counter() - start)
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Flush pending writes on the next iteration of the event loop."""
+        if self._flush_handle is None:
+            self._dirty_since = time.monotonic()
+            self._flush_handle = self._hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write the state of every entity touched since the last flush."""
+        self._flush_handle = None
+        if self._grace is not None:
+            # The panel resets its status on disconnect, so hold the writes
+            return
+        dirty, self._dirty = self._dirty, set()
+        if self.profiler is not None:
+            self._async_flush_profiled(dirty, self.profiler)
+        else:
+            for entity in dirty:
+                if entity.async_write_ha_state_if_changed():
+                    self.state_writes += 1
+                else:
+                    self.suppressed_writes += 1
+        if self._dirty_since is not None:
+            self.metrics.record_write_latency(time.monotonic() - self._dirty_since)
+            self._dirty_since = None
+
+    @callback
+    def _async_flush_profiled(
+        self, dirty: set[BoschAlarmEntity], profiler: BoschAlarmProfiler
+    ) -> None:
+        """Write the state of the entities, timing the evaluation of each."""
+        for entity in dirty:
+            start = time.perf_counter()
+            if entity.async_write_ha_state_if_changed():
+                self.state_writes += 1
+            else:
+                self.suppressed_writes += 1
+            profiler.record(
+                f"state.{type(entity).__name__}", time.perf_counter() - start
+            )
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-from bosch_alarm_mode2 import Panel
+from bosch_alarm_mode2.utils import Observable
 
 from homeassistant.components.sensor import Entity
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN
+from .const import SIGNAL_INVENTORY_RENAMED
+from .inventory import PanelInventory
+from .types import BoschAlarmData
 
 PARALLEL_UPDATES = 0
 
@@ -17,35 +21,63 @@ class BoschAlarmEntity(Entity):
 
     _attr_has_entity_name = True
 
-    def __init__(
-        self, panel: Panel, unique_id: str, observe_faults: bool = False
-    ) -> None:
+    def __init__(self, data: BoschAlarmData, unique_id: str) -> None:
         """Set up a entity for a bosch alarm panel."""
-        self.panel = panel
-        self._observe_faults = observe_faults
+        self.panel = data.panel
+        self._dispatcher = data.dispatcher
         self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, unique_id)},
-            name=f"Bosch {panel.model}",
-            manufacturer="Bosch Security Systems",
-        )
+        self._attr_device_info = data.devices.panel
+        self._flat = data.devices.flat
+        self._last_published: tuple[bool, StateType] | None = None
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.panel.connection_status()
+        return self._dispatcher.available
 
     async def async_added_to_hass(self) -> None:
         """Observe state changes."""
-        self.panel.connection_status_observer.attach(self.schedule_update_ha_state)
-        if self._observe_faults:
-            self.panel.faults_observer.attach(self.schedule_update_ha_state)
+        # The platform writes the initial state as soon as this returns.
+        self._last_published = (self.available, self.state)
+        self.async_on_remove(self._dispatcher.async_add_entity(self))
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> bool:
+        """Write the state if it or the availability changed since the last write."""
+        published = (self.available, self.state)
+        if published == self._last_published:
+            return False
+        self._last_published = published
+        self.async_write_ha_state()
+        return True
+
+    @callback
+    def _async_observe(self, observable: Observable) -> None:
+        """Write the state of this entity whenever the observable fires."""
+        self.async_on_remove(self._dispatcher.async_add_listener(observable, self))
+
+    @callback
+    def _async_observe_renames(self, key: str, id: int) -> None:
+        """Refresh the name of this entity when the panel renames its target."""
+
+        @callback
+        def async_renamed(renamed: PanelInventory) -> None:
+            if id in getattr(renamed, key):
+                self._async_update_name()
+                self.async_write_ha_state()
+
+        assert self.platform.config_entry
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_INVENTORY_RENAMED.format(self.platform.config_entry.entry_id),
+                async_renamed,
+            )
+        )
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Stop observing state changes."""
-        self.panel.connection_status_observer.detach(self.schedule_update_ha_state)
-        if self._observe_faults:
-            self.panel.faults_observer.attach(self.schedule_update_ha_state)
+    @callback
+    def _async_update_name(self) -> None:
+        """Refresh the name of this entity from its panel object."""
 
 
 class BoschAlarmAreaEntity(BoschAlarmEntity):
@@ -53,7 +85,7 @@ class BoschAlarmAreaEntity(BoschAlarmEntity):
 
     def __init__(
         self,
-        panel: Panel,
+        data: BoschAlarmData,
         area_id: int,
         unique_id: str,
         observe_alarms: bool,
@@ -61,117 +93,94 @@ class BoschAlarmAreaEntity(BoschAlarmEntity):
         observe_status: bool,
     ) -> None:
         """Set up a area related entity for a bosch alarm panel."""
-        super().__init__(panel, unique_id)
+        super().__init__(data, unique_id)
         self._area_id = area_id
         self._area_unique_id = f"{unique_id}_area_{area_id}"
         self._observe_alarms = observe_alarms
         self._observe_ready = observe_ready
         self._observe_status = observe_status
-        self._area = panel.areas[area_id]
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._area_unique_id)},
-            name=self._area.name,
-            manufacturer="Bosch Security Systems",
-            via_device=(DOMAIN, unique_id),
-        )
+        self._area = self.panel.areas[area_id]
+        self._attr_device_info = data.devices.area(area_id)
 
     async def async_added_to_hass(self) -> None:
         """Observe state changes."""
         await super().async_added_to_hass()
         if self._observe_alarms:
-            self._area.alarm_observer.attach(self.schedule_update_ha_state)
-        if self._observe_ready:
-            self._area.ready_observer.attach(self.schedule_update_ha_state)
-        if self._observe_status:
-            self._area.status_observer.attach(self.schedule_update_ha_state)
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Stop observing state changes."""
-        await super().async_added_to_hass()
-        if self._observe_alarms:
-            self._area.alarm_observer.detach(self.schedule_update_ha_state)
+            self._async_observe(self._area.alarm_observer)
         if self._observe_ready:
-            self._area.ready_observer.detach(self.schedule_update_ha_state)
+            self._async_observe(self._area.ready_observer)
         if self._observe_status:
-            self._area.status_observer.detach(self.schedule_update_ha_state)
+            self._async_observe(self._area.status_observer)
 
 
 class BoschAlarmPointEntity(BoschAlarmEntity):
     """A base entity for point related entities within a bosch alarm panel."""
 
-    def __init__(self, panel: Panel, point_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, point_id: int, unique_id: str) -> None:
         """Set up a area related entity for a bosch alarm panel."""
-        super().__init__(panel, unique_id)
+        super().__init__(data, unique_id)
         self._point_id = point_id
         self._point_unique_id = f"{unique_id}_point_{point_id}"
-        self._point = panel.points[point_id]
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._point_unique_id)},
-            name=self._point.name,
-            manufacturer="Bosch Security Systems",
-            via_device=(DOMAIN, unique_id),
-        )
+        self._point = self.panel.points[point_id]
+        self._attr_device_info = data.devices.point(point_id)
+        if self._flat:
+            # Points share the panel device, so they are named after themselves
+            self._async_update_name()
 
     async def async_added_to_hass(self) -> None:
         """Observe state changes."""
         await super().async_added_to_hass()
-        self._point.status_observer.attach(self.schedule_update_ha_state)
+        self._async_observe(self._point.status_observer)
+        if self._flat:
+            self._async_observe_renames("points", self._point_id)
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Stop observing state changes."""
-        await super().async_added_to_hass()
-        self._point.status_observer.detach(self.schedule_update_ha_state)
+    @callback
+    def _async_update_name(self) -> None:
+        """Refresh the name of this entity from its point."""
+        self._attr_name = self._point.name
 
 
 class BoschAlarmDoorEntity(BoschAlarmEntity):
     """A base entity for area related entities within a bosch alarm panel."""
 
-    def __init__(self, panel: Panel, door_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, door_id: int, unique_id: str) -> None:
         """Set up a area related entity for a bosch alarm panel."""
-        super().__init__(panel, unique_id)
+        super().__init__(data, unique_id)
         self._door_id = door_id
-        self._door = panel.doors[door_id]
+        self._door = self.panel.doors[door_id]
         self._door_unique_id = f"{unique_id}_door_{door_id}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._door_unique_id)},
-            name=self._door.name,
-            manufacturer="Bosch Security Systems",
-            via_device=(DOMAIN, unique_id),
-        )
+        self._attr_device_info = data.devices.door(door_id)
 
     async def async_added_to_hass(self) -> None:
         """Observe state changes."""
         await super().async_added_to_hass()
-        self._door.status_observer.attach(self.schedule_update_ha_state)
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Stop observing state changes."""
-        await super().async_added_to_hass()
-        self._door.status_observer.detach(self.schedule_update_ha_state)
+        self._async_observe(self._door.status_observer)
+        if self._flat:
+            self._async_observe_renames("doors", self._door_id)
 
 
 class BoschAlarmOutputEntity(BoschAlarmEntity):
     """A base entity for area related entities within a bosch alarm panel."""
 
-    def __init__(self, panel: Panel, output_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, output_id: int, unique_id: str) -> None:
         """Set up a output related entity for a bosch alarm panel."""
-        super().__init__(panel, unique_id)
+        super().__init__(data, unique_id)
         self._output_id = output_id
-        self._output = panel.outputs[output_id]
+        self._output = self.panel.outputs[output_id]
         self._output_unique_id = f"{unique_id}_output_{output_id}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._output_unique_id)},
-            name=self._output.name,
-            manufacturer="Bosch Security Systems",
-            via_device=(DOMAIN, unique_id),
-        )
+        self._attr_device_info = data.devices.output(output_id)
+        if self._flat:
+            # Outputs share the panel device, so they are named after themselves
+            self._async_update_name()
 
     async def async_added_to_hass(self) -> None:
         """Observe state changes."""
         await super().async_added_to_hass()
-        self._output.status_observer.attach(self.schedule_update_ha_state)
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Stop observing state changes."""
-        await super().async_added_to_hass()
-        self._output.status_observer.detach(self.schedule_update_ha_state)
+        self._async_observe(self._output.status_observer)
+        if self._flat:
+            self._async_observe_renames("outputs", self._output_id)
+
+    @callback
+    def _async_update_name(self) -> None:
+        """Refresh the name of this entity from its output."""
+        self._attr_name = self._output.name
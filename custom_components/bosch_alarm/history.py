@@ -0,0 +1,229 @@
+"""Incremental history sync for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import datetime
+import logging
+import os
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from bosch_alarm_mode2 import Panel
+from bosch_alarm_mode2.history import HistoryEvent
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_HISTORY_SIZE,
+    CONF_PERSIST_HISTORY,
+    DEFAULT_HISTORY_SIZE,
+    DOMAIN,
+    EVENT_HISTORY,
+)
+
+if TYPE_CHECKING:
+    from .types import BoschAlarmConfigEntry
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryCursor(NamedTuple):
+    """The id and date of the last history event handled."""
+
+    id: int
+    date: datetime
+
+
+class BoschAlarmHistorySync:
+    """Fire a bus event for every history event of a panel exactly once.
+
+    The id and date of the last event fired are stored per panel, so events
+    that are loaded again after a restart or reconnect are skipped. Event ids
+    wrap around on some panels, so events are ordered by date. Only the events
+    appended to the panel since the last sync are looked at, so the cost of a
+    sync does not grow with the size of the panel log. The first sync of a
+    panel starts from its most recent event instead of replaying the log.
+
+    The events held by the panel are capped at the configured history size,
+    oldest first, so memory use stays flat however long the entry runs. With
+    persistent history enabled, evicted events are appended to a JSON lines
+    file in the .storage directory instead of being dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: BoschAlarmConfigEntry) -> None:
+        """Initialise the history sync."""
+        self._hass = hass
+        self._entry = entry
+        self._panel: Panel
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.history.{entry.unique_id or entry.entry_id}",
+        )
+        self._cursor: HistoryCursor | None = None
+        self._index = 0
+        self._size: int = entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE)
+        self._persist: bool = entry.options.get(CONF_PERSIST_HISTORY, False)
+        self._spill_path = hass.config.path(
+            STORAGE_DIR, f"{DOMAIN}_history_{entry.unique_id or entry.entry_id}.jsonl"
+        )
+        self._spilled: HistoryCursor | None = None
+        self._spill_queue: list[str] = []
+        self._spill_task: asyncio.Task[None] | None = None
+        self.observer_count = 0
+
+    async def async_start(self, panel: Panel) -> None:
+        """Load the stored cursor and start following the history of a panel."""
+        if data := await self._store.async_load():
+            # A cursor stored without a date starts again from the newest event
+            self._cursor = _load_cursor(data, "last_event")
+            self._spilled = _load_cursor(data, "last_spilled")
+        self._panel = panel
+        panel.history_observer.attach(self._async_history_changed)
+        self.observer_count = 1
+        # The history may have been loaded while connecting during setup
+        self._async_history_changed()
+
+    async def async_shutdown(self) -> None:
+        """Stop following the history and store the cursor right away."""
+        self._panel.history_observer.detach(self._async_history_changed)
+        self.observer_count = 0
+        if self._spill_task is not None:
+            await self._spill_task
+        if self._cursor is not None:
+            await self._store.async_save(self._data_to_save())
+
+    @property
+    def last_event_id(self) -> int | None:
+        """Return the id of the last event fired."""
+        return self._cursor.id if self._cursor is not None else None
+
+    async def async_remove(self) -> None:
+        """Remove the stored cursor and the spill file."""
+        await self._store.async_remove()
+        await self._hass.async_add_executor_job(self._remove_spill_file)
+
+    @callback
+    def _async_history_changed(self) -> None:
+        """Fire the events appended to the history since the last sync."""
+        events = self._panel.events
+        if len(events) < self._index:
+            # The panel started its event list over, so look at all of it
+            self._index = 0
+        new = events[self._index :]
+        self._index = len(events)
+        if not new:
+            return
+        if self._cursor is not None:
+            for event in _events_after(new, self._cursor):
+                self._hass.bus.async_fire(
+                    EVENT_HISTORY,
+                    {ATTR_CONFIG_ENTRY_ID: self._entry.entry_id, **_event_data(event)},
+                )
+        self._cursor = _cursor(new[-1])
+        if (excess := len(events) - self._size) > 0:
+            if self._persist:
+                self._async_spill(events[:excess])
+            # The panel appends to this list, so it is trimmed in place
+            del events[:excess]
+            self._index -= excess
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_spill(self, events: list[HistoryEvent]) -> None:
+        """Queue evicted events to be appended to the spill file."""
+        if self._spilled is not None:
+            # Events loaded again after a restart may have been spilled before
+            events = _events_after(events, self._spilled)
+        if not events:
+            return
+        self._spilled = _cursor(events[-1])
+        self._spill_queue.extend(json_dumps(_event_data(event)) for event in events)
+        if self._spill_task is None:
+            self._spill_task = self._entry.async_create_background_task(
+                self._hass, self._async_write_spill(), f"{DOMAIN}_spill_history"
+            )
+
+    async def _async_write_spill(self) -> None:
+        """Append the queued events to the spill file, one batch at a time."""
+        try:
+            while self._spill_queue:
+                lines, self._spill_queue = self._spill_queue, []
+                try:
+                    await self._hass.async_add_executor_job(self._append, lines)
+                except OSError as err:
+                    _LOGGER.warning(
+                        "Could not write history to %s: %s", self._spill_path, err
+                    )
+        finally:
+            self._spill_task = None
+
+    def _append(self, lines: list[str]) -> None:
+        """Append lines to the spill file."""
+        os.makedirs(os.path.dirname(self._spill_path), exist_ok=True)
+        with open(self._spill_path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _remove_spill_file(self) -> None:
+        """Remove the spill file, if events were ever spilled."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._spill_path)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the cursors to store."""
+        return {
+            **_dump_cursor(self._cursor, "last_event"),
+            **_dump_cursor(self._spilled, "last_spilled"),
+        }
+
+
+def _event_data(event: HistoryEvent) -> dict[str, Any]:
+    """Return a history event as JSON serializable data."""
+    return {"id": event.id, "date": event.date.isoformat(), "message": event.message}
+
+
+def _cursor(event: HistoryEvent) -> HistoryCursor:
+    """Return a cursor pointing at a history event."""
+    return HistoryCursor(event.id, event.date)
+
+
+def _events_after(
+    events: list[HistoryEvent], cursor: HistoryCursor
+) -> list[HistoryEvent]:
+    """Return the events that came after the cursor.
+
+    The library keeps the history in date order, so events are compared by
+    date. Events with the same date as the cursor are only after it if they
+    follow it in the list, or if the cursor is not in the list at all.
+    """
+    passed = not any(_cursor(event) == cursor for event in events)
+    after: list[HistoryEvent] = []
+    for event in events:
+        if event.date > cursor.date or (event.date == cursor.date and passed):
+            after.append(event)
+        elif _cursor(event) == cursor:
+            passed = True
+    return after
+
+
+def _load_cursor(data: dict[str, Any], key: str) -> HistoryCursor | None:
+    """Return a cursor stored under a key prefix, if there is one."""
+    if data.get(f"{key}_date") is None:
+        return None
+    return HistoryCursor(data[f"{key}_id"], datetime.fromisoformat(data[f"{key}_date"]))
+
+
+def _dump_cursor(cursor: HistoryCursor | None, key: str) -> dict[str, Any]:
+    """Return a cursor to store under a key prefix."""
+    return {
+        f"{key}_id": cursor.id if cursor is not None else None,
+        f"{key}_date": cursor.date.isoformat() if cursor is not None else None,
+    }
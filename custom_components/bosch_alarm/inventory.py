@@ -0,0 +1,247 @@
+"""Persistent inventory snapshots for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from ssl import SSLError
+from typing import Any
+
+from bosch_alarm_mode2 import Panel
+from bosch_alarm_mode2.panel import Area, Door, Output, PanelEntity, Point
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SIGNAL_INVENTORY_ADDED, SIGNAL_INVENTORY_RENAMED
+from .startup import async_get_startup_priority, async_get_startup_scheduler
+from .types import BoschAlarmConfigEntry
+
+STORAGE_VERSION = 1
+
+INVENTORY_TYPES: dict[str, tuple[type[PanelEntity], str]] = {
+    "areas": (Area, "area"),
+    "points": (Point, "point"),
+    "doors": (Door, "door"),
+    "outputs": (Output, "output"),
+}
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PanelInventory:
+    """Ids of the areas, points, doors and outputs of a panel."""
+
+    areas: list[int] = field(default_factory=list)
+    points: list[int] = field(default_factory=list)
+    doors: list[int] = field(default_factory=list)
+    outputs: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_panel(cls, panel: Panel) -> PanelInventory:
+        """Return the full inventory of a panel."""
+        return cls(
+            list(panel.areas),
+            list(panel.points),
+            list(panel.doors),
+            list(panel.outputs),
+        )
+
+    def __bool__(self) -> bool:
+        """Return True if the inventory is not empty."""
+        return bool(self.areas or self.points or self.doors or self.outputs)
+
+
+class BoschAlarmInventoryStore:
+    """Cache the inventory of a panel so entities can be set up before it connects.
+
+    The snapshot is keyed by the serial number of the panel, falling back to the
+    config entry id for panels that do not report one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: BoschAlarmConfigEntry) -> None:
+        """Initialise the inventory store."""
+        self._hass = hass
+        self._entry = entry
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.inventory.{entry.unique_id or entry.entry_id}",
+        )
+
+    async def async_load(self, panel: Panel) -> bool:
+        """Populate the panel from the stored snapshot, if there is one."""
+        if not (snapshot := await self._store.async_load()):
+            return False
+        panel.model = snapshot["model"]
+        panel.protocol_version = snapshot["protocol_version"]
+        panel.firmware_version = snapshot["firmware_version"]
+        panel.serial_number = snapshot["serial_number"]
+        for key, (entity_type, _) in INVENTORY_TYPES.items():
+            setattr(
+                panel,
+                key,
+                {int(id): entity_type(name) for id, name in snapshot[key].items()},
+            )
+        return True
+
+    async def async_save(self, panel: Panel) -> None:
+        """Store a snapshot of the panel inventory."""
+        await self._store.async_save(
+            {
+                "model": panel.model,
+                "protocol_version": panel.protocol_version,
+                "firmware_version": panel.firmware_version,
+                "serial_number": panel.serial_number,
+                **{
+                    key: {id: entity.name for id, entity in getattr(panel, key).items()}
+                    for key in INVENTORY_TYPES
+                },
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
+
+    async def async_reconcile(self, panel: Panel) -> None:
+        """Connect to a panel set up from a snapshot and apply inventory changes.
+
+        Entities keep the panel objects they were created with, so objects for ids
+        that are still configured are kept and only their names are refreshed.
+        The entities stay unavailable until the status of the panel is loaded.
+        """
+        release = self._entry.runtime_data.dispatcher.async_hold_availability()
+        try:
+            await self._async_reconcile(panel)
+        finally:
+            release()
+
+    async def _async_reconcile(self, panel: Panel) -> None:
+        """Connect to a panel, apply inventory changes and load its status."""
+        known: dict[str, dict[int, PanelEntity]] = {
+            key: getattr(panel, key) for key in INVENTORY_TYPES
+        }
+        try:
+            async with async_get_startup_scheduler(self._hass).async_admit(
+                self._hass,
+                self._entry.entry_id,
+                async_get_startup_priority(self._hass, self._entry.entry_id),
+            ):
+                await panel.connect(Panel.LOAD_EXTENDED_INFO | Panel.LOAD_ENTITIES)
+        except (PermissionError, ValueError):
+            _restore(panel, known)
+            await panel.disconnect()
+            self._entry.async_start_reauth(self._hass)
+            return
+        except (TimeoutError, OSError, ConnectionRefusedError, SSLError):
+            # The panel keeps reconnecting in the background using the snapshot
+            _restore(panel, known)
+            _LOGGER.warning(
+                "Unable to connect to %s, using the stored inventory",
+                self._entry.title,
+            )
+            return
+
+        added: dict[str, list[int]] = {}
+        removed: dict[str, list[int]] = {}
+        renamed: dict[str, list[int]] = {}
+        for key, entities in known.items():
+            loaded: dict[int, PanelEntity] = getattr(panel, key)
+            added[key] = [id for id in loaded if id not in entities]
+            removed[key] = [id for id in entities if id not in loaded]
+            renamed[key] = []
+            for id, entity in entities.items():
+                if id in loaded and entity.name != loaded[id].name:
+                    entity.name = loaded[id].name
+                    renamed[key].append(id)
+            setattr(panel, key, {id: entities.get(id, loaded[id]) for id in loaded})
+
+        await self.async_save(panel)
+        self._async_update_devices(panel, removed, renamed)
+        self._entry.runtime_data.devices.async_provision(
+            self._hass, self._entry.entry_id
+        )
+        if renamed_inventory := PanelInventory(**renamed):
+            async_dispatcher_send(
+                self._hass,
+                SIGNAL_INVENTORY_RENAMED.format(self._entry.entry_id),
+                renamed_inventory,
+            )
+        if added_inventory := PanelInventory(**added):
+            async_dispatcher_send(
+                self._hass,
+                SIGNAL_INVENTORY_ADDED.format(self._entry.entry_id),
+                added_inventory,
+            )
+        try:
+            await panel.load(Panel.LOAD_STATUS)
+        except (TimeoutError, OSError, asyncio.InvalidStateError) as err:
+            # The reconnect supervisor reloads the status once the link is back
+            _LOGGER.warning(
+                "Unable to load the status of %s: %s", self._entry.title, err
+            )
+
+    @callback
+    def _async_update_devices(
+        self,
+        panel: Panel,
+        removed: dict[str, list[int]],
+        renamed: dict[str, list[int]],
+    ) -> None:
+        """Remove the devices and entities of deleted ids and rename renamed ones.
+
+        Entities are also removed by unique id, as with the panel layout points,
+        doors and outputs have no device of their own to remove them with.
+        """
+        device_registry = dr.async_get(self._hass)
+        unique_id = self._entry.unique_id or self._entry.entry_id
+        if device := device_registry.async_get_device({(DOMAIN, unique_id)}):
+            device_registry.async_update_device(
+                device.id, sw_version=panel.firmware_version
+            )
+        devices = self._entry.runtime_data.devices
+        for key, (_, prefix) in INVENTORY_TYPES.items():
+            for id in (*removed[key], *renamed[key]):
+                devices.async_forget(prefix, id)
+            for id in removed[key]:
+                if device := device_registry.async_get_device(
+                    {(DOMAIN, f"{unique_id}_{prefix}_{id}")}
+                ):
+                    device_registry.async_update_device(
+                        device.id, remove_config_entry_id=self._entry.entry_id
+                    )
+            for id in renamed[key]:
+                if device := device_registry.async_get_device(
+                    {(DOMAIN, f"{unique_id}_{prefix}_{id}")}
+                ):
+                    device_registry.async_update_device(
+                        device.id, name=getattr(panel, key)[id].name
+                    )
+        stale = {
+            f"{unique_id}_{prefix}_{id}"
+            for key, (_, prefix) in INVENTORY_TYPES.items()
+            for id in removed[key]
+        }
+        if not stale:
+            return
+        # The unique id of an entity is that of its target, or extends it
+        extended = tuple(f"{stale_id}_" for stale_id in stale)
+        entity_registry = er.async_get(self._hass)
+        for entity_entry in er.async_entries_for_config_entry(
+            entity_registry, self._entry.entry_id
+        ):
+            if entity_entry.unique_id in stale or entity_entry.unique_id.startswith(
+                extended
+            ):
+                entity_registry.async_remove(entity_entry.entity_id)
+
+
+def _restore(panel: Panel, known: dict[str, dict[int, PanelEntity]]) -> None:
+    """Put back the entity objects a failed load may have replaced."""
+    for key, entities in known.items():
+        setattr(panel, key, entities)
@@ -0,0 +1,86 @@
+"""Performance metrics of the link to a Bosch Alarm panel."""
+
+from __future__ import annotations
+
+from collections import deque
+import statistics
+import time
+
+EVENT_WINDOW = 60
+LATENCY_SAMPLES = 256
+
+
+class BoschAlarmMetrics:
+    """Cheap running metrics of a panel, updated from the dispatcher hot path.
+
+    Push events are counted in one bucket per second over the last minute.
+    State write latency and the time commands wait in the queue keep the most
+    recent samples, and are only summarised when a metric sensor is read.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the metrics."""
+        self._event_buckets = [0] * EVENT_WINDOW
+        self._event_second = int(time.monotonic())
+        self._write_latency: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._command_wait: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.reconnects = 0
+        self.last_command_seconds: float | None = None
+
+    def record_event(self, now: float) -> None:
+        """Count a push event received from the panel."""
+        second = int(now)
+        if second != self._event_second:
+            self._advance(second)
+        self._event_buckets[second % EVENT_WINDOW] += 1
+
+    def record_write_latency(self, seconds: float) -> None:
+        """Record the time from an observer callback to the state write."""
+        self._write_latency.append(seconds)
+
+    def record_command(self, seconds: float) -> None:
+        """Record the round trip time of a command sent to the panel."""
+        self.last_command_seconds = seconds
+
+    def record_command_wait(self, seconds: float) -> None:
+        """Record the time a command waited in the queue before it was sent."""
+        self._command_wait.append(seconds)
+
+    @property
+    def events_per_minute(self) -> int:
+        """Return the number of push events received in the last minute."""
+        self._advance(int(time.monotonic()))
+        return sum(self._event_buckets)
+
+    @property
+    def write_latency_mean(self) -> float | None:
+        """Return the mean state write latency in seconds."""
+        if not self._write_latency:
+            return None
+        return statistics.fmean(self._write_latency)
+
+    @property
+    def write_latency_p95(self) -> float | None:
+        """Return the 95th percentile of the state write latency in seconds."""
+        return _p95(self._write_latency)
+
+    @property
+    def command_wait_p95(self) -> float | None:
+        """Return the 95th percentile of the command queue wait in seconds."""
+        return _p95(self._command_wait)
+
+    def _advance(self, second: int) -> None:
+        """Clear the buckets of the seconds that passed without events."""
+        for elapsed in range(
+            self._event_second + 1, min(second, self._event_second + EVENT_WINDOW) + 1
+        ):
+            self._event_buckets[elapsed % EVENT_WINDOW] = 0
+        self._event_second = max(second, self._event_second)
+
+
+def _p95(samples: deque[float]) -> float | None:
+    """Return the 95th percentile of some samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
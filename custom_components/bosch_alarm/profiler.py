@@ -0,0 +1,66 @@
+"""Sampling of the hot paths of a Bosch Alarm panel."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any
+
+# Upper bounds of the histogram buckets, in milliseconds
+HISTOGRAM_BOUNDS_MS = (0.01, 0.1, 1.0, 10.0, 100.0)
+
+
+@dataclass(slots=True)
+class _Timing:
+    """Aggregated timings of one hot path."""
+
+    buckets: list[int]
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class BoschAlarmProfiler:
+    """Aggregate call counts and time histograms while a profile is running.
+
+    The dispatcher records observer callbacks, the state evaluation of every
+    entity it writes and the commands sent to the panel, keyed by hot path.
+    The histogram bounds can be widened for slower timings, such as how long
+    the panel takes to confirm a command.
+    """
+
+    def __init__(self, bounds_ms: tuple[float, ...] = HISTOGRAM_BOUNDS_MS) -> None:
+        """Initialise an empty profile."""
+        self._bounds_ms = bounds_ms
+        self._timings: dict[str, _Timing] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one call of a hot path."""
+        if (timing := self._timings.get(name)) is None:
+            timing = self._timings[name] = _Timing([0] * (len(self._bounds_ms) + 1))
+        timing.count += 1
+        timing.total += seconds
+        timing.max = max(timing.max, seconds)
+        timing.buckets[bisect_left(self._bounds_ms, seconds * 1000)] += 1
+
+    def mean(self, *names: str) -> float | None:
+        """Return the mean time of one or more hot paths in seconds."""
+        timings = [self._timings[name] for name in names if name in self._timings]
+        if not (count := sum(timing.count for timing in timings)):
+            return None
+        return sum(timing.total for timing in timings) / count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the profile, with times in milliseconds."""
+        labels = [f"<={bound:g}ms" for bound in self._bounds_ms]
+        labels.append(f">{self._bounds_ms[-1]:g}ms")
+        return {
+            name: {
+                "count": timing.count,
+                "total_ms": timing.total * 1000,
+                "mean_ms": timing.total * 1000 / timing.count,
+                "max_ms": timing.max * 1000,
+                "histogram": dict(zip(labels, timing.buckets, strict=True)),
+            }
+            for name, timing in sorted(self._timings.items())
+        }
@@ -0,0 +1,110 @@
+"""Reconnect supervisor for Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from ssl import SSLError
+from typing import TYPE_CHECKING
+
+from bosch_alarm_mode2 import Panel
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .types import BoschAlarmConfigEntry
+
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 300.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BoschAlarmReconnectSupervisor:
+    """Reconnect to a panel with exponential backoff after its link drops.
+
+    The library retries a dropped connection every 30 seconds on its own. The
+    supervisor takes over from it once the panel was connected and the link
+    drops. Its first attempt comes after about a second, and the delay doubles
+    with each failure, with jitter so sites that drop together do not retry
+    together. Only the status of the panel is reloaded on reconnect, as its
+    inventory is already known.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: BoschAlarmConfigEntry, panel: Panel
+    ) -> None:
+        """Initialise the supervisor."""
+        self._hass = hass
+        self._entry = entry
+        self._panel = panel
+        self._connected = panel.connection_status()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+        self.attempts = 0
+        self.observer_count = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start watching the connection of the panel."""
+        self._panel.connection_status_observer.attach(self._async_status_changed)
+        self.observer_count = 1
+
+    async def async_shutdown(self) -> None:
+        """Stop watching the connection and cancel any reconnect in progress."""
+        self._panel.connection_status_observer.detach(self._async_status_changed)
+        self.observer_count = 0
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    @callback
+    def _async_status_changed(self) -> None:
+        """Start reconnecting when a connected panel drops its link."""
+        connected = self._panel.connection_status()
+        dropped = self._connected and not connected
+        self._connected = connected
+        if dropped and self._task is None:
+            self._task = self._entry.async_create_background_task(
+                self._hass, self._async_reconnect(), f"{DOMAIN}_reconnect"
+            )
+
+    async def _async_reconnect(self) -> None:
+        """Reconnect to the panel, backing off after each failed attempt."""
+        try:
+            # Stop the library from retrying on its own schedule
+            await self._panel.disconnect()
+            self.attempts = 0
+            # Panel.disconnect swallows a cancellation that arrives while it
+            # waits for the library monitor, so shutdown is also flagged
+            while not self._stopping:
+                delay = min(BACKOFF_MAX, BACKOFF_INITIAL * 2**self.attempts)
+                await asyncio.sleep(delay * random.uniform(0.5, 1))
+                self.attempts += 1
+                try:
+                    await self._panel.connect(Panel.LOAD_STATUS)
+                except (PermissionError, ValueError):
+                    await self._panel.disconnect()
+                    self._entry.async_start_reauth(self._hass)
+                    return
+                except (TimeoutError, OSError, ConnectionRefusedError, SSLError) as err:
+                    await self._panel.disconnect()
+                    _LOGGER.debug(
+                        "Reconnect attempt %d to %s failed: %s",
+                        self.attempts,
+                        self._entry.title,
+                        err,
+                    )
+                    continue
+                _LOGGER.debug(
+                    "Reconnected to %s after %d attempts",
+                    self._entry.title,
+                    self.attempts,
+                )
+                return
+        finally:
+            self._task = None
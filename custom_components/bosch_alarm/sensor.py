@@ -4,53 +4,50 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 
-from bosch_alarm_mode2 import Panel
-from bosch_alarm_mode2.const import ALARM_MEMORY_PRIORITIES
 from bosch_alarm_mode2.panel import Area
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
 from . import BoschAlarmConfigEntry
-from .entity import BoschAlarmAreaEntity
-
-ALARM_TYPES = {
-    "burglary": {
-        ALARM_MEMORY_PRIORITIES.BURGLARY_SUPERVISORY: "supervisory",
-        ALARM_MEMORY_PRIORITIES.BURGLARY_TROUBLE: "trouble",
-        ALARM_MEMORY_PRIORITIES.BURGLARY_ALARM: "alarm",
-    },
-    "gas": {
-        ALARM_MEMORY_PRIORITIES.GAS_SUPERVISORY: "supervisory",
-        ALARM_MEMORY_PRIORITIES.GAS_TROUBLE: "trouble",
-        ALARM_MEMORY_PRIORITIES.GAS_ALARM: "alarm",
-    },
-    "fire": {
-        ALARM_MEMORY_PRIORITIES.FIRE_SUPERVISORY: "supervisory",
-        ALARM_MEMORY_PRIORITIES.FIRE_TROUBLE: "trouble",
-        ALARM_MEMORY_PRIORITIES.FIRE_ALARM: "alarm",
-    },
-}
+from .const import ALARM_TYPES, SIGNAL_INVENTORY_ADDED
+from .dispatcher import BoschAlarmDispatcher
+from .entity import BoschAlarmAreaEntity, BoschAlarmEntity
+from .inventory import PanelInventory
+from .types import BoschAlarmData
 
 
 @dataclass(kw_only=True, frozen=True)
 class BoschAlarmSensorEntityDescription(SensorEntityDescription):
     """Describes Bosch Alarm sensor entity."""
 
-    value_fn: Callable[[Area], str | int]
+    value_fn: Callable[[BoschAlarmDispatcher, Area], str | int]
     observe_alarms: bool = False
     observe_ready: bool = False
     observe_status: bool = False
 
 
-def priority_value_fn(priority_info: dict[int, str]) -> Callable[[Area], str]:
+@dataclass(kw_only=True, frozen=True)
+class BoschAlarmMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes Bosch Alarm panel metric sensor entity."""
+
+    value_fn: Callable[[BoschAlarmData], StateType]
+
+
+def priority_value_fn(alarm_type: str) -> Callable[[BoschAlarmDispatcher, Area], str]:
     """Build a value_fn for a given priority type."""
-    return lambda area: next(
-        (key for priority, key in priority_info.items() if priority in area.alarms_ids),
-        "no_issues",
-    )
+    return lambda dispatcher, area: dispatcher.alarm_index(area)[alarm_type]
 
 
 SENSOR_TYPES: list[BoschAlarmSensorEntityDescription] = [
@@ -58,20 +55,129 @@ SENSOR_TYPES: list[BoschAlarmSensorEntityDescription] = [
         BoschAlarmSensorEntityDescription(
             key=f"alarms_{key}",
             translation_key=f"alarms_{key}",
-            value_fn=priority_value_fn(priority_type),
+            value_fn=priority_value_fn(key),
             observe_alarms=True,
         )
-        for key, priority_type in ALARM_TYPES.items()
+        for key in ALARM_TYPES
     ],
     BoschAlarmSensorEntityDescription(
         key="faulting_points",
         translation_key="faulting_points",
-        value_fn=lambda area: area.faults,
+        value_fn=lambda _, area: area.faults,
         observe_ready=True,
     ),
 ]
 
 
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+METRIC_SENSOR_TYPES: list[BoschAlarmMetricSensorEntityDescription] = [
+    BoschAlarmMetricSensorEntityDescription(
+        key="push_events_per_minute",
+        translation_key="push_events_per_minute",
+        native_unit_of_measurement="events/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.dispatcher.metrics.events_per_minute,
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="write_latency_mean",
+        translation_key="write_latency_mean",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: _milliseconds(data.dispatcher.metrics.write_latency_mean),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="write_latency_p95",
+        translation_key="write_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: _milliseconds(data.dispatcher.metrics.write_latency_p95),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.dispatcher.metrics.reconnects,
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="command_round_trip",
+        translation_key="command_round_trip",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: _milliseconds(
+            data.dispatcher.metrics.last_command_seconds
+        ),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="command_queue_depth",
+        translation_key="command_queue_depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.dispatcher.commands.depth,
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="command_wait_p95",
+        translation_key="command_wait_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: _milliseconds(data.dispatcher.metrics.command_wait_p95),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="arm_confirmation_latency",
+        translation_key="arm_confirmation_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: _milliseconds(
+            data.dispatcher.confirmations.mean_latency("area_arm_all", "area_arm_part")
+        ),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="disarm_confirmation_latency",
+        translation_key="disarm_confirmation_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: _milliseconds(
+            data.dispatcher.confirmations.mean_latency("area_disarm")
+        ),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="output_confirmation_latency",
+        translation_key="output_confirmation_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: _milliseconds(
+            data.dispatcher.confirmations.mean_latency(
+                "set_output_active", "set_output_inactive"
+            )
+        ),
+    ),
+    BoschAlarmMetricSensorEntityDescription(
+        key="observer_callbacks",
+        translation_key="observer_callbacks",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.observer_count,
+    ),
+]
+
+# Only the panel metric sensors are polled
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: BoschAlarmConfigEntry,
@@ -79,13 +185,28 @@ async def async_setup_entry(
 ) -> None:
     """Set up bosch alarm sensors."""
 
-    panel = config_entry.runtime_data
+    data = config_entry.runtime_data
     unique_id = config_entry.unique_id or config_entry.entry_id
 
+    @callback
+    def async_add_inventory(inventory: PanelInventory) -> None:
+        async_add_entities(
+            BoschAreaSensor(data, area_id, unique_id, template)
+            for area_id in inventory.areas
+            for template in SENSOR_TYPES
+        )
+
     async_add_entities(
-        BoschAreaSensor(panel, area_id, unique_id, template)
-        for area_id in panel.areas
-        for template in SENSOR_TYPES
+        PanelMetricSensor(data, unique_id, description)
+        for description in METRIC_SENSOR_TYPES
+    )
+    async_add_inventory(PanelInventory.from_panel(data.panel))
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_INVENTORY_ADDED.format(config_entry.entry_id),
+            async_add_inventory,
+        )
     )
 
 
@@ -99,14 +220,14 @@ class BoschAreaSensor(BoschAlarmAreaEntity, SensorEntity):
 
     def __init__(
         self,
-        panel: Panel,
+        data: BoschAlarmData,
         area_id: int,
         unique_id: str,
         entity_description: BoschAlarmSensorEntityDescription,
     ) -> None:
         """Set up an area sensor entity for a bosch alarm panel."""
         super().__init__(
-            panel,
+            data,
             area_id,
             unique_id,
             entity_description.observe_alarms,
@@ -119,4 +240,36 @@ class BoschAreaSensor(BoschAlarmAreaEntity, SensorEntity):
     @property
     def native_value(self) -> str | int:
         """Return the state of the sensor."""
-        return self.entity_description.value_fn(self._area)
+        return self.entity_description.value_fn(self._dispatcher, self._area)
+
+
+class PanelMetricSensor(BoschAlarmEntity, SensorEntity):
+    """A diagnostic sensor for the performance of the link to a panel."""
+
+    entity_description: BoschAlarmMetricSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        data: BoschAlarmData,
+        unique_id: str,
+        entity_description: BoschAlarmMetricSensorEntityDescription,
+    ) -> None:
+        """Set up a metric sensor entity for a bosch alarm panel."""
+        super().__init__(data, unique_id)
+        self._data = data
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{unique_id}_{entity_description.key}"
+        # Metrics change with every event, so they are sampled instead of pushed
+        self._attr_should_poll = True
+
+    @property
+    def available(self) -> bool:
+        """Return True, as the metrics are also of interest while disconnected."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._data)
@@ -3,22 +3,48 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Mapping
+import cProfile
 import datetime as dt
+import time
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util import dt as dt_util
 
+from .commands import PRIORITY_ARM, PRIORITY_DEFAULT, PRIORITY_DISARM, Command
+from .confirmations import ExpectedState, area_armed, area_disarmed, output_active
 from .const import (
+    ARM_AREAS_SERVICE_NAME,
+    ARM_MODE_AWAY,
+    ARM_MODE_HOME,
+    AREAS_ATTR,
+    AFTER_ID_ATTR,
     ATTR_CONFIG_ENTRY_ID,
+    CPROFILE_ATTR,
     DATETIME_ATTR,
+    DISARM_AREAS_SERVICE_NAME,
     DOMAIN,
+    DURATION_ATTR,
+    GET_HISTORY_SERVICE_NAME,
+    LIMIT_ATTR,
+    MODE_ATTR,
+    OUTPUTS_ATTR,
+    PROFILE_SERVICE_NAME,
     SET_DATE_TIME_SERVICE_NAME,
+    SET_OUTPUTS_SERVICE_NAME,
 )
+from .profiler import BoschAlarmProfiler
 from .types import BoschAlarmConfigEntry
 
 SET_DATE_TIME_SCHEMA = vol.Schema(
@@ -28,28 +54,117 @@ SET_DATE_TIME_SCHEMA = vol.Schema(
     }
 )
 
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(DURATION_ATTR, default=10): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(CPROFILE_ATTR, default=False): cv.boolean,
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(AFTER_ID_ATTR): cv.positive_int,
+        vol.Optional(LIMIT_ATTR, default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+DISARM_AREAS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(AREAS_ATTR): vol.All(
+            cv.ensure_list, [vol.Coerce(int)], vol.Length(min=1)
+        ),
+    }
+)
+
+ARM_AREAS_SCHEMA = DISARM_AREAS_SCHEMA.extend(
+    {
+        vol.Optional(MODE_ATTR, default=ARM_MODE_AWAY): vol.In(
+            [ARM_MODE_AWAY, ARM_MODE_HOME]
+        ),
+    }
+)
+
+SET_OUTPUTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(OUTPUTS_ATTR): vol.All(
+            {vol.Coerce(int): cv.boolean}, vol.Length(min=1)
+        ),
+    }
+)
+
+
+def _get_loaded_entry(hass: HomeAssistant, entry_id: str) -> BoschAlarmConfigEntry:
+    """Return a loaded bosch alarm config entry."""
+    config_entry: BoschAlarmConfigEntry | None
+    if not (config_entry := hass.config_entries.async_get_entry(entry_id)):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="integration_not_found",
+            translation_placeholders={"target": DOMAIN},
+        )
+    if config_entry.state != ConfigEntryState.LOADED:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="not_loaded",
+            translation_placeholders={"target": config_entry.title},
+        )
+    return config_entry
+
+
+async def _async_send_commands(
+    config_entry: BoschAlarmConfigEntry,
+    kind: str,
+    known: Mapping[int, Any],
+    commands: dict[int, Command],
+    expect: Callable[[int], ExpectedState],
+    priority: int = PRIORITY_DEFAULT,
+) -> ServiceResponse:
+    """Send commands to several areas or outputs at once and return each result."""
+    if unknown := [target_id for target_id in commands if target_id not in known]:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key=f"{kind}_not_found",
+            translation_placeholders={
+                "target": config_entry.title,
+                f"{kind}s": ", ".join(map(str, unknown)),
+            },
+        )
+    dispatcher = config_entry.runtime_data.dispatcher
+
+    async def async_send(target_id: int, command: Command) -> dict[str, Any]:
+        try:
+            await dispatcher.async_command(
+                command,
+                target_id,
+                target=kind,
+                priority=priority,
+                expect=expect(target_id),
+            )
+        except Exception as err:
+            return {f"{kind}_id": target_id, "success": False, "error": str(err)}
+        return {f"{kind}_id": target_id, "success": True}
+
+    start = time.monotonic()
+    results = await asyncio.gather(*map(async_send, commands, commands.values()))
+    return {"elapsed": time.monotonic() - start, "results": results}
+
 
 def setup_services(hass: HomeAssistant) -> None:
     """Set up the services for the bosch alarm integration."""
 
     async def async_set_panel_date(call: ServiceCall) -> None:
         """Set the date and time on a bosch alarm panel."""
-        config_entry: BoschAlarmConfigEntry | None
         value: dt.datetime = call.data.get(DATETIME_ATTR, dt_util.now())
-        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
-        if not (config_entry := hass.config_entries.async_get_entry(entry_id)):
-            raise ServiceValidationError(
-                translation_domain=DOMAIN,
-                translation_key="integration_not_found",
-                translation_placeholders={"target": DOMAIN},
-            )
-        if config_entry.state != ConfigEntryState.LOADED:
-            raise HomeAssistantError(
-                translation_domain=DOMAIN,
-                translation_key="not_loaded",
-                translation_placeholders={"target": config_entry.title},
-            )
-        panel = config_entry.runtime_data
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        panel = config_entry.runtime_data.panel
         try:
             await panel.set_panel_date(value)
         except ValueError as err:
@@ -63,9 +178,160 @@ def setup_services(hass: HomeAssistant) -> None:
                 translation_placeholders={"target": config_entry.title},
             ) from err
 
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Sample the hot paths of a bosch alarm panel for a while."""
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        dispatcher = config_entry.runtime_data.dispatcher
+        if dispatcher.profiler is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profile_in_progress",
+                translation_placeholders={"target": config_entry.title},
+            )
+        duration: float = call.data[DURATION_ATTR]
+        profile = cProfile.Profile() if call.data[CPROFILE_ATTR] else None
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError as err:
+                # Only one profiler can run at a time, such as the profiler integration
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="profile_in_progress",
+                    translation_placeholders={"target": config_entry.title},
+                ) from err
+        dispatcher.profiler = profiler = BoschAlarmProfiler()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            dispatcher.profiler = None
+            if profile is not None:
+                profile.disable()
+        response: dict = {"duration": duration, "timings": profiler.as_dict()}
+        if profile is not None:
+            path = hass.config.path(f"bosch_alarm_profile_{int(time.time())}.cprof")
+            await hass.async_add_executor_job(profile.dump_stats, path)
+            response["cprofile"] = path
+        return response
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return one page of the history of a bosch alarm panel, oldest first.
+
+        Pages are chained by event id rather than by position, as the oldest
+        events are trimmed from the history while it is read. Paging resumes
+        after the most recent event with the given id, or from the oldest
+        event held if that event has been trimmed since.
+        """
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        events = config_entry.runtime_data.panel.events
+        start = 0
+        if (after_id := call.data.get(AFTER_ID_ATTR)) is not None:
+            for index in range(len(events) - 1, -1, -1):
+                if events[index].id == after_id:
+                    start = index + 1
+                    break
+        page = events[start : start + call.data[LIMIT_ATTR]]
+        return {
+            "total": len(events),
+            "next_after_id": (
+                page[-1].id if page and start + len(page) < len(events) else None
+            ),
+            "events": [
+                {
+                    "id": event.id,
+                    "date": event.date.isoformat(),
+                    "message": event.message,
+                }
+                for event in page
+            ],
+        }
+
+    async def async_arm_areas(call: ServiceCall) -> ServiceResponse:
+        """Arm several areas of a bosch alarm panel at once."""
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        panel = config_entry.runtime_data.panel
+        away = call.data[MODE_ATTR] == ARM_MODE_AWAY
+        command = panel.area_arm_all if away else panel.area_arm_part
+        return await _async_send_commands(
+            config_entry,
+            "area",
+            panel.areas,
+            dict.fromkeys(call.data[AREAS_ATTR], command),
+            lambda area_id: area_armed(panel.areas[area_id], away),
+            PRIORITY_ARM,
+        )
+
+    async def async_disarm_areas(call: ServiceCall) -> ServiceResponse:
+        """Disarm several areas of a bosch alarm panel at once."""
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        panel = config_entry.runtime_data.panel
+        return await _async_send_commands(
+            config_entry,
+            "area",
+            panel.areas,
+            dict.fromkeys(call.data[AREAS_ATTR], panel.area_disarm),
+            lambda area_id: area_disarmed(panel.areas[area_id]),
+            PRIORITY_DISARM,
+        )
+
+    async def async_set_outputs(call: ServiceCall) -> ServiceResponse:
+        """Turn several outputs of a bosch alarm panel on or off at once."""
+        config_entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        panel = config_entry.runtime_data.panel
+        outputs: dict[int, bool] = call.data[OUTPUTS_ATTR]
+        return await _async_send_commands(
+            config_entry,
+            "output",
+            panel.outputs,
+            {
+                output_id: panel.set_output_active
+                if active
+                else panel.set_output_inactive
+                for output_id, active in outputs.items()
+            },
+            lambda output_id: output_active(
+                panel.outputs[output_id], outputs[output_id]
+            ),
+        )
+
     hass.services.async_register(
         DOMAIN,
         SET_DATE_TIME_SERVICE_NAME,
         async_set_panel_date,
         schema=SET_DATE_TIME_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        PROFILE_SERVICE_NAME,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        GET_HISTORY_SERVICE_NAME,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        ARM_AREAS_SERVICE_NAME,
+        async_arm_areas,
+        schema=ARM_AREAS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        DISARM_AREAS_SERVICE_NAME,
+        async_disarm_areas,
+        schema=DISARM_AREAS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SET_OUTPUTS_SERVICE_NAME,
+        async_set_outputs,
+        schema=SET_OUTPUTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,163 @@
+"""Staggered startup of Bosch Alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+STARTUP_CONCURRENCY = 2
+STARTUP_JITTER = 0.5
+
+# Panels with areas that can be armed from Home Assistant are connected to first
+PRIORITY_ARMABLE = 0
+PRIORITY_DEFAULT = 1
+
+DATA_STARTUP_SCHEDULER: HassKey[StartupScheduler] = HassKey(
+    f"{DOMAIN}_startup_scheduler"
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupTiming:
+    """How long a panel waited for and took to connect."""
+
+    wait_seconds: float
+    connect_seconds: float | None = None
+
+
+class StartupScheduler:
+    """Admit panel connections a few at a time, by priority.
+
+    Every config entry connects through the same scheduler, so a restart with
+    many panels does not run all of their TLS handshakes and inventory loads
+    at once. While Home Assistant is starting, each panel also waits a small
+    random delay before asking to be admitted, so panels with the same
+    priority do not all queue in the same order every time.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = STARTUP_CONCURRENCY,
+        jitter: float = STARTUP_JITTER,
+    ) -> None:
+        """Initialise the scheduler."""
+        self._free = concurrency
+        self._jitter = jitter
+        self._waiting: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._started: float | None = None
+        self._finished: float | None = None
+        self.timings: dict[str, StartupTiming] = {}
+
+    @asynccontextmanager
+    async def async_admit(
+        self, hass: HomeAssistant, entry_id: str, priority: int = PRIORITY_DEFAULT
+    ) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it while connecting to a panel."""
+        start = time.monotonic()
+        if self._started is None or not self._busy:
+            # A new round of panels is starting
+            self._started = start
+        if not hass.is_running and self._jitter:
+            await asyncio.sleep(random.uniform(0, self._jitter))
+        await self._async_acquire(priority)
+        admitted = time.monotonic()
+        timing = self.timings[entry_id] = StartupTiming(admitted - start)
+        try:
+            yield
+        finally:
+            self._finished = time.monotonic()
+            timing.connect_seconds = self._finished - admitted
+            self._release()
+        _LOGGER.debug(
+            "Connected to %s after waiting %.2fs in %.2fs",
+            entry_id,
+            timing.wait_seconds,
+            timing.connect_seconds,
+        )
+
+    @property
+    def _busy(self) -> bool:
+        """Return True if a panel is connecting or waiting to."""
+        return bool(self._waiting) or any(
+            timing.connect_seconds is None for timing in self.timings.values()
+        )
+
+    def as_dict(self, entry_id: str) -> dict[str, Any]:
+        """Return the startup timings of a config entry and of all panels."""
+        timing = self.timings.get(entry_id)
+        return {
+            "wait_seconds": timing.wait_seconds if timing else None,
+            "connect_seconds": timing.connect_seconds if timing else None,
+            "total_seconds": (
+                self._finished - self._started
+                if self._started is not None and self._finished is not None
+                else None
+            ),
+        }
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Take a slot, waiting behind panels of the same or a higher priority."""
+        if self._free and not self._waiting:
+            self._free -= 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    @callback
+    def _release(self) -> None:
+        """Hand the slot to the next waiting panel, or free it."""
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+
+@callback
+def async_get_startup_scheduler(hass: HomeAssistant) -> StartupScheduler:
+    """Return the startup scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(DATA_STARTUP_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_STARTUP_SCHEDULER] = StartupScheduler()
+    return scheduler
+
+
+@callback
+def async_get_startup_priority(hass: HomeAssistant, entry_id: str) -> int:
+    """Return the priority to connect to the panel of a config entry with.
+
+    Areas can only be armed from Home Assistant through their enabled alarm
+    control panel entities. A panel that is set up for the first time has
+    none yet, so it is connected to after the panels that do.
+    """
+    if any(
+        entity.domain == Platform.ALARM_CONTROL_PANEL and not entity.disabled
+        for entity in er.async_entries_for_config_entry(er.async_get(hass), entry_id)
+    ):
+        return PRIORITY_ARMABLE
+    return PRIORITY_DEFAULT
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -10,13 +10,18 @@ from bosch_alarm_mode2 import Panel
 from bosch_alarm_mode2.panel import Door
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import BoschAlarmConfigEntry
-from .const import DOMAIN
+from .commands import TARGET_DOOR, TARGET_OUTPUT, Command
+from .confirmations import ExpectedState, output_active
+from .const import DOMAIN, SIGNAL_INVENTORY_ADDED
 from .entity import BoschAlarmDoorEntity, BoschAlarmOutputEntity
+from .inventory import PanelInventory
+from .types import BoschAlarmData
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -24,8 +29,8 @@ class BoschAlarmSwitchEntityDescription(SwitchEntityDescription):
     """Describes Bosch Alarm door entity."""
 
     value_fn: Callable[[Door], bool]
-    on_fn: Callable[[Panel, int], Coroutine[Any, Any, None]]
-    off_fn: Callable[[Panel, int], Coroutine[Any, Any, None]]
+    on_fn: Callable[[Panel], Command]
+    off_fn: Callable[[Panel], Command]
 
 
 DOOR_SWITCH_TYPES: list[BoschAlarmSwitchEntityDescription] = [
@@ -33,22 +38,22 @@ DOOR_SWITCH_TYPES: list[BoschAlarmSwitchEntityDescription] = [
         key="locked",
         translation_key="locked",
         value_fn=lambda door: door.is_locked(),
-        on_fn=lambda panel, door_id: panel.door_relock(door_id),
-        off_fn=lambda panel, door_id: panel.door_unlock(door_id),
+        on_fn=lambda panel: panel.door_relock,
+        off_fn=lambda panel: panel.door_unlock,
     ),
     BoschAlarmSwitchEntityDescription(
         key="secured",
         translation_key="secured",
         value_fn=lambda door: door.is_secured(),
-        on_fn=lambda panel, door_id: panel.door_secure(door_id),
-        off_fn=lambda panel, door_id: panel.door_unsecure(door_id),
+        on_fn=lambda panel: panel.door_secure,
+        off_fn=lambda panel: panel.door_unsecure,
     ),
     BoschAlarmSwitchEntityDescription(
         key="cycling",
         translation_key="cycling",
         value_fn=lambda door: door.is_cycling(),
-        on_fn=lambda panel, door_id: panel.door_cycle(door_id),
-        off_fn=lambda panel, door_id: panel.door_relock(door_id),
+        on_fn=lambda panel: panel.door_cycle,
+        off_fn=lambda panel: panel.door_relock,
     ),
 ]
 
@@ -60,27 +65,39 @@ async def async_setup_entry(
 ) -> None:
     """Set up switch entities for outputs."""
 
-    panel = config_entry.runtime_data
-    entities: list[SwitchEntity] = [
-        PanelOutputEntity(
-            panel, output_id, config_entry.unique_id or config_entry.entry_id
+    data = config_entry.runtime_data
+
+    @callback
+    def async_add_inventory(inventory: PanelInventory) -> None:
+        entities: list[SwitchEntity] = [
+            PanelOutputEntity(
+                data, output_id, config_entry.unique_id or config_entry.entry_id
+            )
+            for output_id in inventory.outputs
+        ]
+
+        entities.extend(
+            PanelDoorEntity(
+                data,
+                door_id,
+                config_entry.unique_id or config_entry.entry_id,
+                entity_description,
+            )
+            for door_id in inventory.doors
+            for entity_description in DOOR_SWITCH_TYPES
         )
-        for output_id in panel.outputs
-    ]
-
-    entities.extend(
-        PanelDoorEntity(
-            panel,
-            door_id,
-            config_entry.unique_id or config_entry.entry_id,
-            entity_description,
+
+        async_add_entities(entities)
+
+    async_add_inventory(PanelInventory.from_panel(data.panel))
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_INVENTORY_ADDED.format(config_entry.entry_id),
+            async_add_inventory,
         )
-        for door_id in panel.doors
-        for entity_description in DOOR_SWITCH_TYPES
     )
 
-    async_add_entities(entities)
-
 
 PARALLEL_UPDATES = 0
 
@@ -92,15 +109,30 @@ class PanelDoorEntity(BoschAlarmDoorEntity, SwitchEntity):
 
     def __init__(
         self,
-        panel: Panel,
+        data: BoschAlarmData,
         door_id: int,
         unique_id: str,
         entity_description: BoschAlarmSwitchEntityDescription,
     ) -> None:
         """Set up a switch entity for a door on a bosch alarm panel."""
-        super().__init__(panel, door_id, unique_id)
+        super().__init__(data, door_id, unique_id)
         self.entity_description = entity_description
         self._attr_unique_id = f"{self._door_unique_id}_{entity_description.key}"
+        if self._flat:
+            # Doors share the panel device, so the door name is part of the name
+            self._attr_translation_key = f"door_{entity_description.translation_key}"
+            self._attr_translation_placeholders = {"door": self._door.name}
+
+    @callback
+    def _async_update_name(self) -> None:
+        """Refresh the door name in the name of this entity."""
+        self._attr_translation_placeholders = {"door": self._door.name}
+        # The name is translated once, so the new name is set as _attr_name
+        if name := self.platform.platform_translations.get(
+            f"component.{DOMAIN}.entity.{self.platform.domain}"
+            f".{self.translation_key}.name"
+        ):
+            self._attr_name = name.format(**self.translation_placeholders)
 
     @property
     def is_on(self) -> bool:
@@ -114,7 +146,12 @@ class PanelDoorEntity(BoschAlarmDoorEntity, SwitchEntity):
             raise HomeAssistantError(
                 translation_domain=DOMAIN, translation_key="incorrect_door_state"
             )
-        await self.entity_description.on_fn(self.panel, self._door_id)
+        await self._dispatcher.async_command(
+            self.entity_description.on_fn(self.panel),
+            self._door_id,
+            target=TARGET_DOOR,
+            expect=self._expected_state(True),
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Run the off function."""
@@ -123,7 +160,19 @@ class PanelDoorEntity(BoschAlarmDoorEntity, SwitchEntity):
             raise HomeAssistantError(
                 translation_domain=DOMAIN, translation_key="incorrect_door_state"
             )
-        await self.entity_description.off_fn(self.panel, self._door_id)
+        await self._dispatcher.async_command(
+            self.entity_description.off_fn(self.panel),
+            self._door_id,
+            target=TARGET_DOOR,
+            expect=self._expected_state(False),
+        )
+
+    def _expected_state(self, is_on: bool) -> ExpectedState:
+        """Return the state of the door once it is switched on or off."""
+        return ExpectedState(
+            self._door.status_observer,
+            lambda: self.entity_description.value_fn(self._door) == is_on,
+        )
 
 
 class PanelOutputEntity(BoschAlarmOutputEntity, SwitchEntity):
@@ -131,9 +180,9 @@ class PanelOutputEntity(BoschAlarmOutputEntity, SwitchEntity):
 
     _attr_name = None
 
-    def __init__(self, panel: Panel, output_id: int, unique_id: str) -> None:
+    def __init__(self, data: BoschAlarmData, output_id: int, unique_id: str) -> None:
         """Set up an output entity for a bosch alarm panel."""
-        super().__init__(panel, output_id, unique_id)
+        super().__init__(data, output_id, unique_id)
         self._attr_unique_id = self._output_unique_id
 
     @property
@@ -143,8 +192,18 @@ class PanelOutputEntity(BoschAlarmOutputEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on this output."""
-        await self.panel.set_output_active(self._output_id)
+        await self._dispatcher.async_command(
+            self.panel.set_output_active,
+            self._output_id,
+            target=TARGET_OUTPUT,
+            expect=output_active(self._output, True),
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off this output."""
-        await self.panel.set_output_inactive(self._output_id)
+        await self._dispatcher.async_command(
+            self.panel.set_output_inactive,
+            self._output_id,
+            target=TARGET_OUTPUT,
+            expect=output_active(self._output, False),
+        )
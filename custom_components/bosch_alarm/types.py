@@ -1,7 +1,35 @@
 """Types for the Bosch Alarm integration."""
 
+from dataclasses import dataclass
+
 from bosch_alarm_mode2 import Panel
 
 from homeassistant.config_entries import ConfigEntry
 
-type BoschAlarmConfigEntry = ConfigEntry[Panel]
+from .devices import BoschAlarmDevices
+from .dispatcher import BoschAlarmDispatcher
+from .history import BoschAlarmHistorySync
+from .reconnect import BoschAlarmReconnectSupervisor
+
+
+@dataclass
+class BoschAlarmData:
+    """Runtime data for a Bosch Alarm config entry."""
+
+    panel: Panel
+    dispatcher: BoschAlarmDispatcher
+    devices: BoschAlarmDevices
+    history: BoschAlarmHistorySync
+    supervisor: BoschAlarmReconnectSupervisor
+
+    @property
+    def observer_count(self) -> int:
+        """Return the number of callbacks attached to panel observables."""
+        return (
+            self.dispatcher.observer_count
+            + self.history.observer_count
+            + self.supervisor.observer_count
+        )
+
+
+type BoschAlarmConfigEntry = ConfigEntry[BoschAlarmData]
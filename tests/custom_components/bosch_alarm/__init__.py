@@ -1,10 +1,13 @@
 """Tests for the Bosch Alarm component."""
 
+from datetime import timedelta
 from unittest.mock import AsyncMock
 
+from homeassistant.components.bosch_alarm.dispatcher import RECONNECT_GRACE
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_fire_time_changed
 
 
 async def setup_integration(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
@@ -20,3 +23,11 @@ async def call_observable(hass: HomeAssistant, observable: AsyncMock) -> None:
     for callback in observable.attach.call_args_list:
         callback[0][0]()
     await hass.async_block_till_done()
+
+
+async def drop_connection(hass: HomeAssistant, panel: AsyncMock) -> None:
+    """Disconnect the panel for longer than the reconnect grace period."""
+    panel.connection_status.return_value = False
+    await call_observable(hass, panel.connection_status_observer)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RECONNECT_GRACE))
+    await hass.async_block_till_done()
@@ -175,6 +175,7 @@ def mock_panel(
             "homeassistant.components.bosch_alarm.Panel", autospec=True
         ) as mock_panel,
         patch("homeassistant.components.bosch_alarm.config_flow.Panel", new=mock_panel),
+        patch("homeassistant.components.bosch_alarm.discovery.Panel", new=mock_panel),
     ):
         client = mock_panel.return_value
         client.areas = {1: area}
@@ -0,0 +1,771 @@
+"""A local Mode 2 panel simulator for end to end and load tests.
+
+The simulator speaks the automation protocol over TLS well enough for the
+bosch_alarm_mode2 library to connect, authenticate, load the inventory,
+subscribe to status updates, poll history and send commands. It emulates a
+B/G series panel and can generate storms of point status updates to measure
+how many events per second an installation keeps up with.
+
+It can also be run on its own to load test a running Home Assistant instance:
+
+    python simulator.py --points 599 --storm-rate 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import logging
+from pathlib import Path
+import ssl
+import tempfile
+import time
+
+from bosch_alarm_mode2.const import (
+    ALARM_MEMORY_PRIORITIES,
+    AREA_ARMING_STATUS,
+    AREA_READY_STATUS,
+    AREA_STATUS,
+    CMD,
+    DOOR_ACTION,
+    DOOR_STATUS,
+    POINT_STATUS,
+    USER_TYPE,
+)
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+B9512G = 0xA7
+
+# Response codes of the automation protocol
+ACK = 0xFC
+NACK = 0xFD
+DATA = 0xFE
+
+# NACK reasons
+ERROR_INVALID_COMMAND = 0x03
+ERROR_DATA_OUT_OF_RANGE = 0x05
+ERROR_NO_AUTHORITY = 0x06
+ERROR_UNSUPPORTED_COMMAND = 0x07
+
+# Status update types pushed to subscribers
+UPDATE_HEARTBEAT = 0x00
+UPDATE_EVENT_SUMMARY = 0x01
+UPDATE_HISTORY = 0x02
+UPDATE_AREA_ON_OFF = 0x04
+UPDATE_AREA_READY = 0x05
+UPDATE_OUTPUT = 0x06
+UPDATE_POINT = 0x07
+UPDATE_DOOR = 0x08
+UPDATE_PANEL_STATUS = 0x0A
+
+# History event codes
+EVENT_POINT_OPENING = 29
+EVENT_OPENING_BY_AREA = 61
+EVENT_CLOSING_BY_AREA = 67
+
+# Commands that are accepted before authenticating
+UNAUTHENTICATED_COMMANDS = {CMD.WHAT_ARE_YOU, CMD.AUTHENTICATE}
+
+# Replies are framed with a single length byte
+MAX_REPLY_SIZE = 250
+HISTORY_BATCH_SIZE = 16
+MAX_UPDATES_PER_RECORD = 255
+# Clients reset connections that stay quiet for three minutes
+HEARTBEAT_INTERVAL = 60
+
+ARM_STATUS = {
+    AREA_ARMING_STATUS.DISARM: AREA_STATUS.DISARMED,
+    AREA_ARMING_STATUS.MASTER_DELAY: AREA_STATUS.ALL_ARMED[0],
+    AREA_ARMING_STATUS.PERIMETER_DELAY: AREA_STATUS.PART_ARMED[1],
+}
+
+DOOR_ACTION_STATUS = {
+    DOOR_ACTION.CYCLE: DOOR_STATUS.CYCLING,
+    DOOR_ACTION.UNLOCK: DOOR_STATUS.UNLOCKED,
+    DOOR_ACTION.TERMINATE_UNLOCK: DOOR_STATUS.LOCKED,
+    DOOR_ACTION.SECURE: DOOR_STATUS.SECURED,
+    DOOR_ACTION.TERMINATE_SECURE: DOOR_STATUS.LOCKED,
+}
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SimulatedArea:
+    """An area of the simulated panel."""
+
+    name: str
+    status: int = AREA_STATUS.DISARMED
+    ready: int = AREA_READY_STATUS.ALL
+    faults: int = 0
+    alarms: dict[int, set[int]] = field(default_factory=dict)
+
+
+@dataclass
+class SimulatedPoint:
+    """A point of the simulated panel."""
+
+    name: str
+    area: int = 1
+    status: int = POINT_STATUS.NORMAL
+
+
+@dataclass
+class SimulatedDoor:
+    """A door of the simulated panel."""
+
+    name: str
+    status: int = DOOR_STATUS.LOCKED
+
+
+@dataclass
+class SimulatedOutput:
+    """An output of the simulated panel."""
+
+    name: str
+    active: bool = False
+
+
+@dataclass(frozen=True)
+class SimulatedEvent:
+    """A history event of the simulated panel."""
+
+    code: int
+    area: int
+    params: tuple[int, int, int]
+    date: datetime
+
+
+def _int16(value: int) -> bytes:
+    return value.to_bytes(2, "big")
+
+
+def _int32(value: int) -> bytes:
+    return value.to_bytes(4, "big")
+
+
+def _entity_set(ids: list[int]) -> bytes:
+    """Encode ids as a bitmask, with id 1 in the top bit of the first byte."""
+    mask = bytearray((max(ids, default=0) + 7) // 8)
+    for id in ids:
+        mask[(id - 1) // 8] |= 0x80 >> ((id - 1) % 8)
+    return bytes(mask)
+
+
+def _ids_from_set(mask: bytes) -> list[int]:
+    return [
+        index * 8 + bit + 1
+        for index, byte in enumerate(mask)
+        for bit in range(8)
+        if byte & (0x80 >> bit)
+    ]
+
+
+def _polled_timestamp(date: datetime) -> int:
+    return (
+        (date.year - 2010) << 26
+        | date.month << 22
+        | date.day << 17
+        | date.hour << 12
+        | date.minute << 6
+        | date.second
+    )
+
+
+def _subscription_timestamp(date: datetime) -> int:
+    return (
+        date.second << 26
+        | (date.year - 2010) << 20
+        | (date.month - 1) << 16
+        | (date.day - 1) << 11
+        | date.hour << 6
+        | date.minute
+    )
+
+
+def _capabilities() -> bytes:
+    """Return the protocol capability bitmask of the simulated panel."""
+    bitmask = bytearray(33)
+    bitmask[0] |= 0x40  # subscriptions
+    bitmask[2] |= 0x10  # alarm memory summary, format 2
+    bitmask[5] |= 0x08  # panel system status
+    bitmask[7] |= 0x08  # area text, format 3
+    bitmask[8] |= 0x40  # doors
+    bitmask[8] |= 0x10  # door text, format 1
+    bitmask[9] |= 0x10  # output text, format 3
+    bitmask[11] |= 0x20  # point text, format 3
+    bitmask[13] |= 0x04  # product serial
+    bitmask[24] |= 0x40  # subscriptions, format 2
+    return bytes(bitmask)
+
+
+def create_ssl_context() -> ssl.SSLContext:
+    """Return a server context with a freshly generated self signed certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bosch-alarm-simulator")])
+    now = datetime.now(UTC)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_file = Path(tmp, "cert.pem")
+        key_file = Path(tmp, "key.pem")
+        cert_file.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+        key_file.write_bytes(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+type Handler = Callable[
+    [PanelSimulator, _SimulatorConnection, bytes],
+    tuple[bytes, Callable[[], None] | None],
+]
+
+
+def _configured(kind: str) -> Handler:
+    """Return a handler replying with the set of configured entities of a kind."""
+
+    def handler(
+        simulator: PanelSimulator, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        return _reply(_entity_set(list(getattr(simulator, kind)))), None
+
+    return handler
+
+
+def _names(kind: str) -> Handler:
+    """Return a handler replying with names of entities of a kind, CF03 style."""
+
+    def handler(
+        simulator: PanelSimulator, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        after = int.from_bytes(data[:2], "big")
+        names = bytearray()
+        for id, entity in getattr(simulator, kind).items():
+            if id <= after:
+                continue
+            name = _int16(id) + entity.name.encode() + b"\x00"
+            if len(names) + len(name) > MAX_REPLY_SIZE:
+                break
+            names += name
+        # An empty acknowledgement signals there are no more names
+        return (_reply(names) if names else bytes([ACK])), None
+
+    return handler
+
+
+class PanelSimulator:
+    """A simulated B/G series panel served over TLS on localhost.
+
+    Every command received is counted in `commands`, and every status update
+    pushed to subscribers is counted in `updates_sent`.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: int = B9512G,
+        automation_code: str = "1234567890",
+        serial_number: int = 1234567890,
+        areas: int = 1,
+        points: int = 8,
+        doors: int = 1,
+        outputs: int = 1,
+        history_events: int = 5,
+    ) -> None:
+        """Initialise the simulator."""
+        self.model = model
+        self.automation_code = automation_code
+        self.serial_number = serial_number
+        self.firmware_version = (3, 14)
+        self.faults = 0
+        self.areas = {id: SimulatedArea(f"Area {id}") for id in range(1, areas + 1)}
+        self.points = {
+            id: SimulatedPoint(f"Point {id}", (id - 1) % areas + 1)
+            for id in range(1, points + 1)
+        }
+        self.doors = {id: SimulatedDoor(f"Door {id}") for id in range(1, doors + 1)}
+        self.outputs = {
+            id: SimulatedOutput(f"Output {id}") for id in range(1, outputs + 1)
+        }
+        start = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+        self.history = [
+            SimulatedEvent(
+                EVENT_POINT_OPENING,
+                1,
+                ((id - 1) % max(points, 1) + 1, 0, 0),
+                start + timedelta(minutes=id),
+            )
+            for id in range(1, history_events + 1)
+        ]
+        self.clock_offset = timedelta()
+        self.commands: Counter[int] = Counter()
+        self.updates_sent = 0
+        self.host = "127.0.0.1"
+        self.port = 0
+        self._connections: set[_SimulatorConnection] = set()
+        self._server: asyncio.Server | None = None
+
+    @property
+    def subscribers(self) -> list[_SimulatorConnection]:
+        """Return the connections subscribed to status updates."""
+        return [conn for conn in self._connections if conn.subscribed]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving, on a free port unless one is given."""
+        self._server = await asyncio.get_running_loop().create_server(
+            lambda: _SimulatorConnection(self),
+            host=host,
+            port=port,
+            ssl=create_ssl_context(),
+        )
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        """Close every connection and stop serving."""
+        for conn in list(self._connections):
+            conn.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def disconnect_clients(self) -> None:
+        """Drop every client connection, as a panel reboot would."""
+        for conn in list(self._connections):
+            conn.close()
+
+    def heartbeat(self) -> None:
+        """Tell subscribers the panel is still alive."""
+        self._push([(UPDATE_HEARTBEAT, [])])
+
+    def set_point_status(self, point_id: int, status: int) -> None:
+        """Change the status of a point and notify subscribers."""
+        self.points[point_id].status = status
+        self._push([(UPDATE_POINT, [_int16(point_id) + bytes([status])])])
+
+    def set_area_ready(self, area_id: int, ready: int, faults: int = 0) -> None:
+        """Change the readiness of an area and notify subscribers."""
+        area = self.areas[area_id]
+        area.ready, area.faults = ready, faults
+        self._push(
+            [(UPDATE_AREA_READY, [_int16(area_id) + bytes([ready]) + _int16(faults)])]
+        )
+
+    def set_faults(self, faults: int) -> None:
+        """Change the panel faults bitmap and notify subscribers."""
+        self.faults = faults
+        self._push([(UPDATE_PANEL_STATUS, [self._panel_status()[:6]])])
+
+    def trigger_alarm(self, area_id: int, point_id: int, priority: int) -> None:
+        """Raise an alarm of a given priority in an area."""
+        self.areas[area_id].alarms.setdefault(priority, set()).add(point_id)
+        self._push_event_summary(priority)
+
+    def clear_alarms(self) -> None:
+        """Clear the alarm memory of every area."""
+        priorities = {p for area in self.areas.values() for p in area.alarms}
+        for area in self.areas.values():
+            area.alarms.clear()
+        for priority in sorted(priorities):
+            self._push_event_summary(priority)
+
+    def add_history_event(
+        self, code: int, area: int, params: tuple[int, int, int] = (0, 0, 0)
+    ) -> None:
+        """Append an event to the history log and notify subscribers."""
+        now = datetime.now().replace(microsecond=0)
+        if self.history and now < self.history[-1].date:
+            now = self.history[-1].date
+        event = SimulatedEvent(code, area, params, now)
+        self.history.append(event)
+        raw = (
+            _int32(len(self.history) - 1)
+            + _int16(code)
+            + _int16(area)
+            + b"".join(_int16(param) for param in params)
+            + _int32(_subscription_timestamp(event.date))
+            + bytes(5)
+            + _int16(0)  # text length
+        )
+        self._push([(UPDATE_HISTORY, [raw])])
+
+    async def event_storm(
+        self, rate: float, duration: float, *, tick: float = 0.01
+    ) -> int:
+        """Flip point statuses at `rate` events per second for `duration` seconds.
+
+        Updates due within a tick are batched into a single push message, as a
+        panel does when several points change at once. Returns the number of
+        point updates sent.
+        """
+        point_ids = list(self.points)
+        sent = 0
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while (elapsed := loop.time() - start) < duration:
+            due = int(rate * elapsed) - sent
+            updates = []
+            for _ in range(due):
+                point_id = point_ids[sent % len(point_ids)]
+                point = self.points[point_id]
+                point.status = (
+                    POINT_STATUS.OPEN[1]
+                    if point.status == POINT_STATUS.NORMAL
+                    else POINT_STATUS.NORMAL
+                )
+                updates.append(_int16(point_id) + bytes([point.status]))
+                sent += 1
+            if updates:
+                self._push([(UPDATE_POINT, updates)])
+            await asyncio.sleep(tick)
+        return sent
+
+    def _push_event_summary(self, priority: int) -> None:
+        count = sum(len(area.alarms.get(priority, ())) for area in self.areas.values())
+        self._push([(UPDATE_EVENT_SUMMARY, [bytes([priority]) + _int16(count)])])
+
+    def _push(self, records: list[tuple[int, list[bytes]]]) -> None:
+        """Send status update records to every subscriber."""
+        payload = bytearray()
+        for update_type, updates in records:
+            for i in range(0, max(len(updates), 1), MAX_UPDATES_PER_RECORD):
+                batch = updates[i : i + MAX_UPDATES_PER_RECORD]
+                payload += bytes([update_type, len(batch)]) + b"".join(batch)
+                self.updates_sent += len(batch)
+        message = bytes([0x02]) + _int16(len(payload)) + payload
+        for conn in self.subscribers:
+            conn.write(message)
+
+    def _panel_status(self) -> bytes:
+        version, revision = self.firmware_version
+        return bytes([version, revision, 0, 0, 0]) + _int16(self.faults) + bytes(3)
+
+    def handle_command(
+        self, conn: _SimulatorConnection, code: int, data: bytes
+    ) -> tuple[bytes, Callable[[], None] | None]:
+        """Return the reply to a command, and what to do once it was sent."""
+        self.commands[code] += 1
+        if not conn.authenticated and code not in UNAUTHENTICATED_COMMANDS:
+            return bytes([NACK, ERROR_NO_AUTHORITY]), None
+        handler = self._handlers.get(code)
+        if handler is None:
+            return bytes([NACK, ERROR_UNSUPPORTED_COMMAND]), None
+        try:
+            return handler(self, conn, data)
+        except (IndexError, KeyError, ValueError):
+            return bytes([NACK, ERROR_DATA_OUT_OF_RANGE]), None
+
+    def _what_are_you(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        info = bytearray(23)
+        info[0] = self.model
+        info[5], info[6] = 5, 208
+        return _reply(info + _capabilities()), None
+
+    def _authenticate(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        code = data[1:].split(b"\x00", 1)[0].decode()
+        conn.authenticated = (
+            data[0] == USER_TYPE.AUTOMATION and code == self.automation_code
+        )
+        return _reply(bytes([int(conn.authenticated)])), None
+
+    def _product_serial(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        return _reply(self.serial_number.to_bytes(6, "big")), None
+
+    def _system_status(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        return _reply(self._panel_status()), None
+
+    def _door_text(self, conn: _SimulatorConnection, data: bytes) -> tuple[bytes, None]:
+        return _reply(self.doors[data[0]].name.encode() + b"\x00"), None
+
+    def _area_status(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        ids = [int.from_bytes(data[i : i + 2], "big") for i in range(0, len(data), 2)]
+        return _reply(
+            b"".join(_int16(id) + bytes([self.areas[id].status]) for id in ids)
+        ), None
+
+    def _point_status(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        ids = [int.from_bytes(data[i : i + 2], "big") for i in range(0, len(data), 2)]
+        return _reply(
+            b"".join(_int16(id) + bytes([self.points[id].status]) for id in ids)
+        ), None
+
+    def _door_status(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        return _reply(b"".join(bytes([id, self.doors[id].status]) for id in data)), None
+
+    def _output_status(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        active = [id for id, output in self.outputs.items() if output.active]
+        return _reply(_entity_set(active)), None
+
+    def _alarm_summary(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        summary = bytearray(2 * max(ALARM_MEMORY_PRIORITIES.TEXT))
+        for priority in ALARM_MEMORY_PRIORITIES.TEXT:
+            count = sum(len(a.alarms.get(priority, ())) for a in self.areas.values())
+            summary[(priority - 1) * 2 : priority * 2] = _int16(count)
+        return _reply(summary), None
+
+    def _alarm_detail(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        priority = data[0]
+        return _reply(
+            b"".join(
+                _int16(area_id) + b"\x00" + _int16(point_id)
+                for area_id, area in self.areas.items()
+                for point_id in sorted(area.alarms.get(priority, ()))
+            )
+        ), None
+
+    def _history_events(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        after = int.from_bytes(data[1:5], "big")
+        if after >= len(self.history):
+            # Reply with the id of the last event written to the log
+            return _reply(bytes([0]) + _int32(len(self.history))), None
+        events = self.history[after : after + HISTORY_BATCH_SIZE]
+        return _reply(
+            bytes([len(events)])
+            + _int32(after)
+            + b"".join(
+                _int16(event.code)
+                + _int16(event.area)
+                + b"".join(_int16(param) for param in event.params)
+                + _int32(_polled_timestamp(event.date))
+                for event in events
+            )
+        ), None
+
+    def _set_subscription(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        conn.subscribed = any(data[1:])
+        return bytes([ACK]), None
+
+    def _area_arm(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, Callable[[], None]]:
+        status = ARM_STATUS[data[0]]
+        area_ids = [id for id in _ids_from_set(data[1:]) if id in self.areas]
+        if not area_ids:
+            raise KeyError(data[1:])
+
+        def notify() -> None:
+            for id in area_ids:
+                self.areas[id].status = status
+            self._push(
+                [
+                    (
+                        UPDATE_AREA_ON_OFF,
+                        [_int16(id) + bytes([status]) for id in area_ids],
+                    )
+                ]
+            )
+            code = (
+                EVENT_OPENING_BY_AREA
+                if status == AREA_STATUS.DISARMED
+                else EVENT_CLOSING_BY_AREA
+            )
+            for id in area_ids:
+                self.add_history_event(code, id, (0, 1, status))
+
+        return bytes([ACK]), notify
+
+    def _set_output_state(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, Callable[[], None]]:
+        output = self.outputs[data[0]]
+
+        def notify() -> None:
+            output.active = bool(data[1])
+            self._push([(UPDATE_OUTPUT, [_int16(data[0]) + bytes([data[1]])])])
+
+        return bytes([ACK]), notify
+
+    def _set_door_state(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, Callable[[], None]]:
+        door = self.doors[data[0]]
+        status = DOOR_ACTION_STATUS[data[1]]
+
+        def notify() -> None:
+            door.status = status
+            self._push([(UPDATE_DOOR, [_int16(data[0]) + bytes([status])])])
+
+        return bytes([ACK]), notify
+
+    def _set_date_time(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        month, day, year, hour, minute = data[:5]
+        date = datetime(2000 + year, month, day, hour, minute)
+        self.clock_offset = date - datetime.now()
+        return bytes([ACK]), None
+
+    def _request_date_time(
+        self, conn: _SimulatorConnection, data: bytes
+    ) -> tuple[bytes, None]:
+        date = datetime.now() + self.clock_offset
+        return _reply(
+            bytes([date.month, date.day, date.year - 2000, date.hour, date.minute])
+        ), None
+
+    _handlers: dict[int, Handler] = {
+        CMD.WHAT_ARE_YOU: _what_are_you,
+        CMD.AUTHENTICATE: _authenticate,
+        CMD.PRODUCT_SERIAL: _product_serial,
+        CMD.REQUEST_PANEL_SYSTEM_STATUS: _system_status,
+        CMD.REQUEST_CONFIGURED_AREAS: _configured("areas"),
+        CMD.REQUEST_CONFIGURED_POINTS: _configured("points"),
+        CMD.REQUEST_CONFIGURED_DOORS: _configured("doors"),
+        CMD.REQUEST_CONFIGURED_OUTPUTS: _configured("outputs"),
+        CMD.AREA_TEXT: _names("areas"),
+        CMD.POINT_TEXT: _names("points"),
+        CMD.OUTPUT_TEXT: _names("outputs"),
+        CMD.DOOR_TEXT: _door_text,
+        CMD.AREA_STATUS: _area_status,
+        CMD.POINT_STATUS: _point_status,
+        CMD.DOOR_STATUS: _door_status,
+        CMD.OUTPUT_STATUS: _output_status,
+        CMD.ALARM_MEMORY_SUMMARY: _alarm_summary,
+        CMD.ALARM_MEMORY_DETAIL: _alarm_detail,
+        CMD.REQUEST_RAW_HISTORY_EVENTS: _history_events,
+        CMD.SET_SUBSCRIPTION: _set_subscription,
+        CMD.AREA_ARM: _area_arm,
+        CMD.SET_OUTPUT_STATE: _set_output_state,
+        CMD.SET_DOOR_STATE: _set_door_state,
+        CMD.SET_DATE_TIME: _set_date_time,
+        CMD.REQUEST_DATE_TIME: _request_date_time,
+    }
+
+
+def _reply(data: bytes) -> bytes:
+    return bytes([DATA]) + data
+
+
+class _SimulatorConnection(asyncio.Protocol):
+    """A client connection to the simulated panel."""
+
+    def __init__(self, simulator: PanelSimulator) -> None:
+        self._simulator = simulator
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self.authenticated = False
+        self.subscribed = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.Transport)
+        self._transport = transport
+        self._simulator._connections.add(self)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._transport = None
+        self._simulator._connections.discard(self)
+
+    def write(self, data: bytes) -> None:
+        if self._transport:
+            self._transport.write(data)
+
+    def close(self) -> None:
+        if self._transport:
+            self._transport.abort()
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= 2:
+            if self._buffer[0] != 0x01:
+                self.write(bytes([0x01, 2, NACK, ERROR_INVALID_COMMAND]))
+                self.close()
+                return
+            length = self._buffer[1] + 2
+            if len(self._buffer) < length:
+                return
+            code, data = self._buffer[2], bytes(self._buffer[3:length])
+            del self._buffer[:length]
+            reply, after_reply = self._simulator.handle_command(self, code, data)
+            self.write(bytes([0x01, len(reply)]) + reply)
+            if after_reply:
+                after_reply()
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7700)
+    parser.add_argument("--automation-code", default="1234567890")
+    parser.add_argument("--areas", type=int, default=1)
+    parser.add_argument("--points", type=int, default=8)
+    parser.add_argument("--doors", type=int, default=1)
+    parser.add_argument("--outputs", type=int, default=1)
+    parser.add_argument("--storm-rate", type=float, default=0.0)
+    parser.add_argument("--storm-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    simulator = PanelSimulator(
+        automation_code=args.automation_code,
+        areas=args.areas,
+        points=args.points,
+        doors=args.doors,
+        outputs=args.outputs,
+    )
+    await simulator.start(args.host, args.port)
+    _LOGGER.info("Serving a simulated panel on %s:%d", simulator.host, simulator.port)
+    try:
+        while True:
+            if args.storm_rate and simulator.subscribers:
+                start = time.perf_counter()
+                sent = await simulator.event_storm(args.storm_rate, args.storm_interval)
+                _LOGGER.info(
+                    "Sent %d point updates at %.0f events/s",
+                    sent,
+                    sent / (time.perf_counter() - start),
+                )
+            else:
+                await asyncio.sleep(HEARTBEAT_INTERVAL)
+                simulator.heartbeat()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
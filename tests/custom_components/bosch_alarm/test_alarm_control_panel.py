@@ -21,7 +21,7 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 
-from . import call_observable, setup_integration
+from . import call_observable, drop_connection, setup_integration
 
 from tests.common import MockConfigEntry, snapshot_platform
 
@@ -138,8 +138,38 @@ async def test_alarm_control_panel_availability(
         == AlarmControlPanelState.DISARMED
     )
 
-    mock_panel.connection_status.return_value = False
-
-    await call_observable(hass, mock_panel.connection_status_observer)
+    await drop_connection(hass, mock_panel)
 
     assert hass.states.get("alarm_control_panel.area1").state == STATE_UNAVAILABLE
+
+
+async def test_command_confirmation(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the time until the panel reports an armed area is recorded."""
+    await setup_integration(hass, mock_config_entry)
+    confirmations = mock_config_entry.runtime_data.dispatcher.confirmations
+    mock_panel.area_arm_part.__name__ = "area_arm_part"
+
+    await hass.services.async_call(
+        ALARM_CONTROL_PANEL_DOMAIN,
+        SERVICE_ALARM_ARM_HOME,
+        {ATTR_ENTITY_ID: "alarm_control_panel.area1"},
+        blocking=True,
+    )
+    assert confirmations.pending == 1
+
+    # A status update that is not the expected state leaves the waiter pending
+    await call_observable(hass, area.status_observer)
+    assert confirmations.pending == 1
+
+    area.is_disarmed.return_value = False
+    area.is_part_armed.return_value = True
+    await call_observable(hass, area.status_observer)
+    assert confirmations.pending == 0
+    assert confirmations.as_dict()["latency"]["area_arm_part"]["count"] == 1
+    assert confirmations.mean_latency("area_arm_part") is not None
+    assert confirmations.mean_latency("area_disarm") is None
@@ -0,0 +1,256 @@
+"""Benchmarks for Bosch Alarm with a panel at G-series limits.
+
+The benchmarks only run with BOSCH_ALARM_BENCHMARKS=1, as wall clock timings
+are too noisy for the default test run. Measurements are compared against the
+baselines in benchmark_baselines.json and fail when they regress by more than
+BENCHMARK_TOLERANCE. Run with BOSCH_ALARM_UPDATE_BENCHMARKS=1 to record new
+baselines.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import json
+import os
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+from unittest.mock import AsyncMock
+
+from bosch_alarm_mode2.panel import Area, Door, Output, Point
+from bosch_alarm_mode2.utils import Observable
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.json import json_bytes
+
+from . import call_observable, drop_connection, setup_integration
+
+from tests.common import MockConfigEntry
+
+BASELINES = Path(__file__).parent / "benchmark_baselines.json"
+BENCHMARK_TOLERANCE = 3.0
+UPDATE_BASELINES = os.environ.get("BOSCH_ALARM_UPDATE_BENCHMARKS") == "1"
+RUN_BENCHMARKS = UPDATE_BASELINES or os.environ.get("BOSCH_ALARM_BENCHMARKS") == "1"
+
+pytestmark = pytest.mark.skipif(
+    not RUN_BENCHMARKS, reason="Set BOSCH_ALARM_BENCHMARKS=1 to run the benchmarks"
+)
+
+AREA_COUNT = 32
+POINT_COUNT = 599
+DOOR_COUNT = 32
+OUTPUT_COUNT = 120
+EVENT_COUNT = 200
+
+
+def _mock_area(area_id: int) -> AsyncMock:
+    mock = AsyncMock(spec=Area)
+    mock.name = f"Area {area_id}"
+    mock.status_observer = AsyncMock(spec=Observable)
+    mock.alarm_observer = AsyncMock(spec=Observable)
+    mock.ready_observer = AsyncMock(spec=Observable)
+    mock.alarms = []
+    mock.alarms_ids = []
+    mock.faults = 0
+    mock.all_ready = True
+    mock.part_ready = True
+    mock.is_triggered.return_value = False
+    mock.is_disarmed.return_value = True
+    mock.is_armed.return_value = False
+    mock.is_arming.return_value = False
+    mock.is_pending.return_value = False
+    mock.is_part_armed.return_value = False
+    mock.is_all_armed.return_value = False
+    return mock
+
+
+def _mock_point(point_id: int) -> AsyncMock:
+    mock = AsyncMock(spec=Point)
+    mock.name = f"Point {point_id}"
+    mock.status_observer = AsyncMock(spec=Observable)
+    mock.is_open.return_value = False
+    mock.is_normal.return_value = True
+    return mock
+
+
+def _mock_door(door_id: int) -> AsyncMock:
+    mock = AsyncMock(spec=Door)
+    mock.name = f"Door {door_id}"
+    mock.status_observer = AsyncMock(spec=Observable)
+    mock.is_open.return_value = False
+    mock.is_cycling.return_value = False
+    mock.is_secured.return_value = False
+    mock.is_locked.return_value = True
+    return mock
+
+
+def _mock_output(output_id: int) -> AsyncMock:
+    mock = AsyncMock(spec=Output)
+    mock.name = f"Output {output_id}"
+    mock.status_observer = AsyncMock(spec=Observable)
+    mock.is_active.return_value = False
+    return mock
+
+
+@pytest.fixture
+def large_panel(mock_panel: AsyncMock) -> AsyncMock:
+    """Return a panel with the maximum inventory of a G-series panel."""
+    mock_panel.areas = {i: _mock_area(i) for i in range(1, AREA_COUNT + 1)}
+    mock_panel.points = {i: _mock_point(i) for i in range(1, POINT_COUNT + 1)}
+    mock_panel.doors = {i: _mock_door(i) for i in range(1, DOOR_COUNT + 1)}
+    mock_panel.outputs = {i: _mock_output(i) for i in range(1, OUTPUT_COUNT + 1)}
+    return mock_panel
+
+
+def _check_baseline(name: str, value: float) -> None:
+    """Compare a measurement with its baseline, or record it when updating."""
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if UPDATE_BASELINES:
+        baselines[name] = round(value, 6)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return
+    if name not in baselines:
+        pytest.fail(f"No baseline for {name}, run with BOSCH_ALARM_UPDATE_BENCHMARKS=1")
+    assert value <= baselines[name] * BENCHMARK_TOLERANCE, (
+        f"{name} regressed: {value:.6f} > {baselines[name]:.6f} x {BENCHMARK_TOLERANCE}"
+    )
+
+
+async def _timed(func: Callable[[], Awaitable[None]]) -> float:
+    start = time.perf_counter()
+    await func()
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_setup_time(
+    hass: HomeAssistant,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure the time to set up a config entry for a large panel."""
+    elapsed = await _timed(lambda: setup_integration(hass, mock_config_entry))
+    assert len(hass.states.async_entity_ids()) > POINT_COUNT
+    _check_baseline("setup_seconds", elapsed)
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_reload_time(
+    hass: HomeAssistant,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure the time to reload a config entry for a large panel."""
+    await setup_integration(hass, mock_config_entry)
+
+    async def reload() -> None:
+        await hass.config_entries.async_reload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    _check_baseline("reload_seconds", await _timed(reload))
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_point_event_latency(
+    hass: HomeAssistant,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure the latency of a single point update reaching the state machine."""
+    await setup_integration(hass, mock_config_entry)
+    points = list(large_panel.points.values())
+    samples = []
+    for i in range(EVENT_COUNT):
+        point = points[i % len(points)]
+        point.is_open.return_value = not point.is_open.return_value
+        samples.append(
+            await _timed(
+                lambda point=point: call_observable(hass, point.status_observer)
+            )
+        )
+    _check_baseline("point_event_seconds", statistics.median(samples))
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_availability_fan_out(
+    hass: HomeAssistant,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure the time to flip the availability of every entity of a panel."""
+    await setup_integration(hass, mock_config_entry)
+    samples = []
+    for available in (False, True, False, True):
+        if available:
+            large_panel.connection_status.return_value = True
+            samples.append(
+                await _timed(
+                    lambda: call_observable(
+                        hass, large_panel.connection_status_observer
+                    )
+                )
+            )
+        else:
+            samples.append(await _timed(lambda: drop_connection(hass, large_panel)))
+    _check_baseline("availability_fan_out_seconds", statistics.median(samples))
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_memory_per_entity(
+    hass: HomeAssistant,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure the memory allocated per entity while setting up a large panel."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        await setup_integration(hass, mock_config_entry)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _check_baseline(
+        "memory_per_entity_bytes",
+        (after - before) / len(hass.states.async_entity_ids()),
+    )
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_device_provisioning(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure provisioning the devices of a panel that were already created."""
+    await setup_integration(hass, mock_config_entry)
+    devices = mock_config_entry.runtime_data.devices
+    assert (
+        len(
+            dr.async_entries_for_config_entry(
+                device_registry, mock_config_entry.entry_id
+            )
+        )
+        == 1 + AREA_COUNT + POINT_COUNT + DOOR_COUNT + OUTPUT_COUNT
+    )
+
+    start = time.perf_counter()
+    assert devices.async_provision(hass, mock_config_entry.entry_id) == 0
+    _check_baseline("provision_existing_devices_seconds", time.perf_counter() - start)
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_device_registry_save_time(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    large_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Measure serializing the device registry once a large panel is set up."""
+    await setup_integration(hass, mock_config_entry)
+    start = time.perf_counter()
+    json_bytes(device_registry._data_to_save())  # noqa: SLF001
+    _check_baseline("device_registry_save_seconds", time.perf_counter() - start)
@@ -7,11 +7,12 @@ from bosch_alarm_mode2.const import ALARM_PANEL_FAULTS
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
-from homeassistant.const import STATE_OFF, STATE_ON, Platform
+from homeassistant.components.bosch_alarm.binary_sensor import PointSensor
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 
-from . import call_observable, setup_integration
+from . import call_observable, drop_connection, setup_integration
 
 from tests.common import MockConfigEntry, snapshot_platform
 
@@ -53,6 +54,10 @@ async def test_panel_faults(
     mock_panel.panel_faults_ids = [ALARM_PANEL_FAULTS.BATTERY_LOW]
     await call_observable(hass, mock_panel.faults_observer)
     assert hass.states.get(entity_id).state == STATE_ON
+    # Only the sensor whose fault bit flipped is written
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    assert dispatcher.state_writes == 1
+    assert dispatcher.suppressed_writes == 0
 
 
 @pytest.mark.parametrize("model", ["b5512"])
@@ -76,3 +81,47 @@ async def test_area_ready_to_arm(
     await call_observable(hass, area.status_observer)
     assert hass.states.get(entity_id).state == STATE_OFF
     assert hass.states.get(entity_id_2).state == STATE_OFF
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_point_updates_coalesced(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    points: dict[int, AsyncMock],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that observer callbacks fired in one tick only write changed states once."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    points[0].is_open.return_value = True
+    with patch.object(
+        PointSensor, "async_write_ha_state", autospec=True
+    ) as mock_write_ha_state:
+        observer = points[0].status_observer.attach.call_args[0][0]
+        observer()
+        observer()
+        mock_panel.connection_status_observer.attach.call_args[0][0]()
+        await hass.async_block_till_done()
+    assert mock_write_ha_state.call_count == 1
+    assert dispatcher.state_writes == 1
+    assert dispatcher.suppressed_writes == 0
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_availability_flip(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that every entity is written once when the panel availability flips."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    entity_ids = hass.states.async_entity_ids()
+    await drop_connection(hass, mock_panel)
+    await call_observable(hass, mock_panel.connection_status_observer)
+    assert not dispatcher.available
+    assert dispatcher.state_writes == len(entity_ids)
+    assert all(
+        hass.states.get(entity_id).state == STATE_UNAVAILABLE
+        for entity_id in entity_ids
+    )
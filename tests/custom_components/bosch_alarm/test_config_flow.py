@@ -6,7 +6,16 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from homeassistant.components.bosch_alarm.const import DOMAIN
+from homeassistant.components.bosch_alarm.const import (
+    CONF_DEVICE_LAYOUT,
+    CONF_HISTORY_SIZE,
+    CONF_NETWORK,
+    CONF_PERSIST_HISTORY,
+    DEFAULT_HISTORY_SIZE,
+    DEVICE_LAYOUT_PANEL,
+    DOMAIN,
+)
+from homeassistant.components.bosch_alarm.discovery import async_get_dhcp_probe_cache
 from homeassistant.config_entries import SOURCE_DHCP, SOURCE_RECONFIGURE, SOURCE_USER
 from homeassistant.const import CONF_HOST, CONF_MAC, CONF_MODEL, CONF_PORT
 from homeassistant.core import HomeAssistant
@@ -57,6 +66,9 @@ async def test_form_user(
     )
     assert result["result"].unique_id == serial_number
     assert len(mock_setup_entry.mock_calls) == 1
+    # Each step connects on its own, and closes its session again
+    assert mock_panel.connect.await_count == 2
+    assert mock_panel.disconnect.await_count == 2
 
 
 @pytest.mark.parametrize(
@@ -156,6 +168,94 @@ async def test_form_exceptions_user(
     assert result["type"] is FlowResultType.CREATE_ENTRY
 
 
+async def test_form_scan(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_panel: AsyncMock,
+    model_name: str,
+    config_flow_data: dict[str, Any],
+) -> None:
+    """Test setting up a panel found by scanning a network."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_HOST: "1.1.1.0/30", CONF_PORT: 7700},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "scan"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NETWORK: "1.1.1.0/30", CONF_PORT: 7700},
+    )
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+    assert result["step_id"] == "scan_progress"
+    assert result["progress_action"] == "scan"
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"])
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "scan_select"
+    assert mock_panel.connect.await_count == 2
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "1.1.1.2"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "auth"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], config_flow_data
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == f"Bosch {model_name}"
+    assert result["data"] == {
+        CONF_HOST: "1.1.1.2",
+        CONF_PORT: 7700,
+        CONF_MODEL: model_name,
+        **config_flow_data,
+    }
+
+
+@pytest.mark.parametrize(
+    ("network", "error"),
+    [
+        ("1.1.1.1/33", {CONF_NETWORK: "invalid_network"}),
+        ("10.0.0.0/8", {CONF_NETWORK: "network_too_large"}),
+        ("1.1.1.0/30", {"base": "no_panels_found"}),
+    ],
+)
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_form_scan_errors(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_panel: AsyncMock,
+    network: str,
+    error: dict[str, str],
+) -> None:
+    """Test errors when scanning a network."""
+    mock_panel.connect.side_effect = asyncio.TimeoutError
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_HOST: network, CONF_PORT: 7700},
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NETWORK: network, CONF_PORT: 7700},
+    )
+    if result["type"] is FlowResultType.SHOW_PROGRESS:
+        await hass.async_block_till_done()
+        result = await hass.config_entries.flow.async_configure(result["flow_id"])
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "scan"
+    assert result["errors"] == error
+
+
 @pytest.mark.parametrize("model", ["solution_3000", "amax_3000"])
 async def test_entry_already_configured_host(
     hass: HomeAssistant,
@@ -280,6 +380,46 @@ async def test_dhcp_exceptions(
     assert result["reason"] == message
 
 
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_dhcp_probe_cached(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_panel: AsyncMock,
+) -> None:
+    """Test repeated DHCP announcements are answered from the probe cache."""
+    mock_panel.connect.side_effect = asyncio.exceptions.TimeoutError()
+    for _ in range(2):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_DHCP},
+            data=DhcpServiceInfo(
+                hostname="test",
+                ip="1.1.1.1",
+                macaddress="34ea34b43b5a",
+            ),
+        )
+        assert result["type"] is FlowResultType.ABORT
+        assert result["reason"] == "cannot_connect"
+    mock_panel.connect.assert_awaited_once()
+    assert async_get_dhcp_probe_cache(hass).as_dict() == {
+        "hits": 1,
+        "misses": 1,
+        "size": 1,
+    }
+
+    # A new address for the same MAC address is probed again
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": SOURCE_DHCP},
+        data=DhcpServiceInfo(
+            hostname="test",
+            ip="1.1.1.2",
+            macaddress="34ea34b43b5a",
+        ),
+    )
+    assert mock_panel.connect.await_count == 2
+
+
 @pytest.mark.parametrize("mac_address", ["34ea34b43b5a"])
 async def test_dhcp_updates_host(
     hass: HomeAssistant,
@@ -564,3 +704,26 @@ async def test_reconfig_flow_incorrect_model(
     await hass.async_block_till_done()
     assert result["type"] is FlowResultType.ABORT
     assert result["reason"] == "device_mismatch"
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_options_flow(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the device layout can be changed in the options."""
+    await setup_integration(hass, mock_config_entry)
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_DEVICE_LAYOUT: DEVICE_LAYOUT_PANEL}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == {
+        CONF_DEVICE_LAYOUT: DEVICE_LAYOUT_PANEL,
+        CONF_HISTORY_SIZE: DEFAULT_HISTORY_SIZE,
+        CONF_PERSIST_HISTORY: False,
+    }
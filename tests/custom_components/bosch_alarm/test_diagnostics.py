@@ -1,10 +1,14 @@
 """Test the Bosch Alarm diagnostics."""
 
+from datetime import datetime
 from typing import Any
 from unittest.mock import AsyncMock
 
+from bosch_alarm_mode2.history import HistoryEvent
 from syrupy.assertion import SnapshotAssertion
+from syrupy.filters import props
 
+from homeassistant.components.bosch_alarm.diagnostics import HISTORY_LIMIT
 from homeassistant.core import HomeAssistant
 
 from . import setup_integration
@@ -29,4 +33,26 @@ async def test_diagnostics(
     await setup_integration(hass, mock_config_entry)
 
     diag = await get_diagnostics_for_config_entry(hass, hass_client, mock_config_entry)
-    assert diag == snapshot
+    assert diag == snapshot(exclude=props("startup"))
+    assert diag["startup"]["wait_seconds"] >= 0
+    assert diag["startup"]["connect_seconds"] >= 0
+    assert diag["startup"]["total_seconds"] >= diag["startup"]["connect_seconds"]
+
+
+async def test_diagnostics_history_is_bounded(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test diagnostics only include the most recent history events."""
+    mock_panel.events = [
+        HistoryEvent(i, datetime(2025, 1, 1), f"Event {i}") for i in range(250)
+    ]
+    await setup_integration(hass, mock_config_entry)
+
+    diag = await get_diagnostics_for_config_entry(hass, hass_client, mock_config_entry)
+    assert diag["data"]["history_events_total"] == 250
+    assert len(diag["data"]["history_events"]) == HISTORY_LIMIT
+    assert diag["data"]["history_events"][-1][2] == "Event 249"
@@ -1,15 +1,38 @@
 """Tests for bosch alarm integration init."""
 
+import asyncio
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
+from bosch_alarm_mode2.history import HistoryEvent
 import pytest
 
+from homeassistant.components.bosch_alarm.const import (
+    CONF_DEVICE_LAYOUT,
+    CONF_HISTORY_SIZE,
+    CONF_PERSIST_HISTORY,
+    DEVICE_LAYOUT_PANEL,
+    DOMAIN,
+    EVENT_HISTORY,
+)
+from homeassistant.components.bosch_alarm.startup import (
+    PRIORITY_ARMABLE,
+    PRIORITY_DEFAULT,
+    StartupScheduler,
+    async_get_startup_priority,
+)
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_OFF, STATE_UNAVAILABLE, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
 
-from . import setup_integration
+from . import call_observable, setup_integration
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_capture_events
 
 
 @pytest.fixture(autouse=True)
@@ -45,3 +68,466 @@ async def test_connection_error(
     mock_panel.connect.side_effect = exception
     await setup_integration(hass, mock_config_entry)
     assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@pytest.fixture
+def inventory_snapshot() -> dict[str, Any]:
+    """Return a stored panel inventory."""
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": "bosch_alarm.inventory.1234567890",
+        "data": {
+            "model": "B5512 (US1B)",
+            "protocol_version": "1.0.0",
+            "firmware_version": "1.0.0",
+            "serial_number": "1234567890",
+            "areas": {"1": "Area1"},
+            "points": {"0": "Window", "7": "Garage"},
+            "doors": {"1": "Main Door"},
+            "outputs": {"1": "Output A"},
+        },
+    }
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_inventory_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the inventory is stored after connecting to the panel."""
+    await setup_integration(hass, mock_config_entry)
+    snapshot = hass_storage["bosch_alarm.inventory.1234567890"]["data"]
+    assert snapshot["model"] == "B5512 (US1B)"
+    assert snapshot["areas"] == {"1": "Area1"}
+    assert snapshot["points"]["6"] == "Bedroom"
+
+    await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "bosch_alarm.inventory.1234567890" not in hass_storage
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_setup_from_inventory(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    inventory_snapshot: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test setup does not wait for the panel when an inventory is stored."""
+    hass_storage["bosch_alarm.inventory.1234567890"] = inventory_snapshot
+    mock_panel.connect.side_effect = TimeoutError()
+    await setup_integration(hass, mock_config_entry)
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert list(mock_panel.points) == [0, 7]
+    assert mock_panel.points[7].name == "Garage"
+    mock_panel.load.assert_not_awaited()
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_inventory_reconcile(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    device_registry: dr.DeviceRegistry,
+    inventory_snapshot: dict[str, Any],
+    mock_panel: AsyncMock,
+    points: dict[int, AsyncMock],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test entities are added and removed when the panel inventory changed."""
+    hass_storage["bosch_alarm.inventory.1234567890"] = inventory_snapshot
+    window = None
+
+    async def connect(load_selector: int) -> None:
+        nonlocal window
+        window = mock_panel.points[0]
+        mock_panel.points = points
+
+    mock_panel.connect.side_effect = connect
+    mock_panel.connection_status.return_value = False
+    with patch(
+        "homeassistant.components.bosch_alarm.PLATFORMS", [Platform.BINARY_SENSOR]
+    ):
+        await setup_integration(hass, mock_config_entry)
+
+    assert hass.states.get("binary_sensor.window").state == STATE_UNAVAILABLE
+    assert hass.states.get("binary_sensor.garage") is None
+    assert hass.states.get("binary_sensor.bedroom").state == STATE_UNAVAILABLE
+    assert (
+        device_registry.async_get_device({("bosch_alarm", "1234567890_point_7")})
+        is None
+    )
+    # Entities of points that still exist keep observing the same object
+    assert mock_panel.points[0] is window
+    assert list(mock_panel.points) == list(points)
+    mock_panel.load.assert_awaited_once()
+    assert (
+        hass_storage["bosch_alarm.inventory.1234567890"]["data"]["points"]["6"]
+        == "Bedroom"
+    )
+
+    mock_panel.connection_status.return_value = True
+    await call_observable(hass, mock_panel.connection_status_observer)
+    assert hass.states.get("binary_sensor.window").state == STATE_OFF
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_inventory_reconcile_waits_for_status(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    inventory_snapshot: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test entities only become available once the panel status is loaded."""
+    hass_storage["bosch_alarm.inventory.1234567890"] = inventory_snapshot
+    loaded = asyncio.Event()
+
+    async def connect(load_selector: int) -> None:
+        mock_panel.connection_status.return_value = True
+        await call_observable(hass, mock_panel.connection_status_observer)
+
+    async def load(load_selector: int) -> None:
+        await loaded.wait()
+        raise asyncio.InvalidStateError("Not connected")
+
+    mock_panel.connect.side_effect = connect
+    mock_panel.load.side_effect = load
+    mock_panel.connection_status.return_value = False
+    with patch(
+        "homeassistant.components.bosch_alarm.PLATFORMS", [Platform.BINARY_SENSOR]
+    ):
+        await setup_integration(hass, mock_config_entry)
+        await asyncio.sleep(0)
+        assert hass.states.get("binary_sensor.window").state == STATE_UNAVAILABLE
+
+        # A failed status load is left to the reconnect supervisor
+        loaded.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert "Unable to load the status" in caplog.text
+    assert hass.states.get("binary_sensor.window").state == STATE_OFF
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_inventory_reconcile_flat_layout(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    entity_registry: er.EntityRegistry,
+    inventory_snapshot: dict[str, Any],
+    mock_panel: AsyncMock,
+    door: AsyncMock,
+    points: dict[int, AsyncMock],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test removed entities go and renamed ones follow with the panel layout."""
+    hass_storage["bosch_alarm.inventory.1234567890"] = inventory_snapshot
+    points[0].name = "Front Window"
+    door.name = "Back Door"
+
+    async def connect(load_selector: int) -> None:
+        mock_panel.points = points
+        mock_panel.doors = {1: door}
+
+    mock_panel.connect.side_effect = connect
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_DEVICE_LAYOUT: DEVICE_LAYOUT_PANEL}
+    )
+    with patch(
+        "homeassistant.components.bosch_alarm.PLATFORMS",
+        [Platform.BINARY_SENSOR, Platform.SWITCH],
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert (
+        entity_registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, "1234567890_point_7"
+        )
+        is None
+    )
+    window = entity_registry.async_get_entity_id(
+        "binary_sensor", DOMAIN, "1234567890_point_0"
+    )
+    assert hass.states.get(window).name == "Bosch B5512 (US1B) Front Window"
+    locked = entity_registry.async_get_entity_id(
+        "switch", DOMAIN, "1234567890_door_1_locked"
+    )
+    assert hass.states.get(locked).name == "Bosch B5512 (US1B) Back Door locked"
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_device_info_shared(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test entities attached to the same device share one device info."""
+    with patch(
+        "homeassistant.components.bosch_alarm.PLATFORMS",
+        [Platform.ALARM_CONTROL_PANEL, Platform.BINARY_SENSOR, Platform.SENSOR],
+    ):
+        await setup_integration(hass, mock_config_entry)
+
+    device_info: dict[str, list[Any]] = {}
+    for platform in async_get_platforms(hass, "bosch_alarm"):
+        for entity in platform.entities.values():
+            (identifier,) = entity.device_info["identifiers"]
+            device_info.setdefault(identifier[1], []).append(entity.device_info)
+    area = device_info["1234567890_area_1"]
+    assert len(area) > 1
+    assert all(info is area[0] for info in area)
+    panel = device_info["1234567890"]
+    assert all(info is panel[0] for info in panel)
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_flat_device_layout(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test switching to the panel layout moves entities to the panel device."""
+    with patch(
+        "homeassistant.components.bosch_alarm.PLATFORMS",
+        [Platform.BINARY_SENSOR, Platform.SWITCH],
+    ):
+        await setup_integration(hass, mock_config_entry)
+        window = entity_registry.async_get("binary_sensor.window")
+        assert device_registry.async_get(window.device_id).name == "Window"
+
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_DEVICE_LAYOUT: DEVICE_LAYOUT_PANEL}
+        )
+        await hass.async_block_till_done()
+
+    panel = device_registry.async_get_device({(DOMAIN, "1234567890")})
+    for entity_id in ("binary_sensor.window", "switch.main_door_locked"):
+        assert entity_registry.async_get(entity_id).device_id == panel.id
+    assert device_registry.async_get_device({(DOMAIN, "1234567890_point_0")}) is None
+    assert device_registry.async_get_device({(DOMAIN, "1234567890_door_1")}) is None
+    assert device_registry.async_get_device({(DOMAIN, "1234567890_area_1")})
+    assert hass.states.get("binary_sensor.window").name == "Bosch B5512 (US1B) Window"
+    assert (
+        hass.states.get("switch.main_door_locked").name
+        == "Bosch B5512 (US1B) Main Door locked"
+    )
+
+
+def _history_event(event_id: int, minute: int | None = None) -> HistoryEvent:
+    return HistoryEvent(
+        event_id,
+        datetime(2025, 1, 1)
+        + timedelta(minutes=event_id if minute is None else minute),
+        f"Event {event_id}",
+    )
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_history_sync(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test new history events are fired once, and only after the stored cursor."""
+    fired = async_capture_events(hass, EVENT_HISTORY)
+    mock_panel.events = [_history_event(i) for i in range(5)]
+    await setup_integration(hass, mock_config_entry)
+    # The first sync of a panel starts from its most recent event
+    assert fired == []
+
+    mock_panel.events.extend(_history_event(i) for i in range(5, 7))
+    await call_observable(hass, mock_panel.history_observer)
+    assert [event.data["id"] for event in fired] == [5, 6]
+    assert fired[0].data == {
+        "config_entry_id": mock_config_entry.entry_id,
+        "id": 5,
+        "date": "2025-01-01T00:05:00",
+        "message": "Event 5",
+    }
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    assert hass_storage["bosch_alarm.history.1234567890"]["data"] == {
+        "last_event_id": 6,
+        "last_event_date": "2025-01-01T00:06:00",
+        "last_spilled_id": None,
+        "last_spilled_date": None,
+    }
+
+    # The panel loads its recent history again after a restart
+    fired.clear()
+    mock_panel.events = [_history_event(i) for i in range(3, 9)]
+    mock_panel.history_observer.attach.reset_mock()
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert [event.data["id"] for event in fired] == [7, 8]
+
+    await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "bosch_alarm.history.1234567890" not in hass_storage
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_history_sync_wrapped_ids(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test events are followed by date when the event ids wrap around."""
+    hass_storage["bosch_alarm.history.1234567890"] = {
+        "version": 1,
+        "key": "bosch_alarm.history.1234567890",
+        "data": {
+            "last_event_id": 510,
+            "last_event_date": "2025-01-01T00:01:00",
+            "last_spilled_id": None,
+            "last_spilled_date": None,
+        },
+    }
+    fired = async_capture_events(hass, EVENT_HISTORY)
+    # The event ids of AMAX panels wrap around after 511
+    mock_panel.events = [
+        _history_event(event_id, minute)
+        for minute, event_id in enumerate([509, 510, 511, 0, 1])
+    ]
+    await setup_integration(hass, mock_config_entry)
+    assert [event.data["id"] for event in fired] == [511, 0, 1]
+    assert mock_config_entry.runtime_data.history.last_event_id == 1
+
+    # Clearing the log on the panel starts the event ids over
+    mock_panel.events.append(_history_event(0, 10))
+    await call_observable(hass, mock_panel.history_observer)
+    assert [event.data["id"] for event in fired] == [511, 0, 1, 0]
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_history_sync_cursor_without_date(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test a cursor stored without a date restarts from the most recent event."""
+    hass_storage["bosch_alarm.history.1234567890"] = {
+        "version": 1,
+        "key": "bosch_alarm.history.1234567890",
+        "data": {"last_event_id": 500},
+    }
+    fired = async_capture_events(hass, EVENT_HISTORY)
+    mock_panel.events = [_history_event(i) for i in range(3)]
+    await setup_integration(hass, mock_config_entry)
+    assert fired == []
+    assert mock_config_entry.runtime_data.history.last_event_id == 2
+
+    mock_panel.events.append(_history_event(3))
+    await call_observable(hass, mock_panel.history_observer)
+    assert [event.data["id"] for event in fired] == [3]
+
+
+@pytest.mark.parametrize("model", ["b5512"])
+async def test_history_ring_buffer(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the panel history is capped, spilling evicted events to disk."""
+    hass.config.config_dir = str(tmp_path)
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_HISTORY_SIZE: 100, CONF_PERSIST_HISTORY: True},
+    )
+    fired = async_capture_events(hass, EVENT_HISTORY)
+    mock_panel.events = [_history_event(i) for i in range(150)]
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(mock_panel.events) == 100
+    assert mock_panel.events[0].id == 50
+
+    for i in range(150, 200):
+        mock_panel.events.append(_history_event(i))
+        await call_observable(hass, mock_panel.history_observer)
+    assert len(mock_panel.events) == 100
+    assert mock_panel.events[0].id == 100
+    # Events are still fired once each as the buffer wraps
+    assert [event.data["id"] for event in fired] == list(range(150, 200))
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    path = tmp_path / ".storage" / "bosch_alarm_history_1234567890.jsonl"
+    lines = (await hass.async_add_executor_job(path.read_text)).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(100))
+
+    await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert not await hass.async_add_executor_job(path.exists)
+
+
+async def test_startup_scheduler(hass: HomeAssistant) -> None:
+    """Test panels are connected to a few at a time, armable panels first."""
+    scheduler = StartupScheduler(concurrency=2, jitter=0)
+    connecting: set[str] = set()
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def connect(entry_id: str, priority: int) -> None:
+        async with scheduler.async_admit(hass, entry_id, priority):
+            connecting.add(entry_id)
+            order.append(entry_id)
+            assert len(connecting) <= 2
+            await release.wait()
+            connecting.discard(entry_id)
+
+    tasks = [
+        asyncio.create_task(connect("first", PRIORITY_DEFAULT)),
+        asyncio.create_task(connect("second", PRIORITY_DEFAULT)),
+        asyncio.create_task(connect("plain", PRIORITY_DEFAULT)),
+        asyncio.create_task(connect("armable", PRIORITY_ARMABLE)),
+    ]
+    await asyncio.sleep(0)
+    assert connecting == {"first", "second"}
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "second", "armable", "plain"]
+    assert scheduler.timings["plain"].wait_seconds >= 0
+    diagnostics = scheduler.as_dict("plain")
+    assert diagnostics["total_seconds"] >= diagnostics["connect_seconds"]
+    assert scheduler.as_dict("unknown")["connect_seconds"] is None
+
+
+async def test_startup_priority(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test panels with enabled alarm control panels are connected to first."""
+    mock_config_entry.add_to_hass(hass)
+    assert (
+        async_get_startup_priority(hass, mock_config_entry.entry_id) == PRIORITY_DEFAULT
+    )
+
+    entity = entity_registry.async_get_or_create(
+        Platform.ALARM_CONTROL_PANEL,
+        DOMAIN,
+        "1234567890_area_1",
+        config_entry=mock_config_entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    assert (
+        async_get_startup_priority(hass, mock_config_entry.entry_id) == PRIORITY_DEFAULT
+    )
+
+    entity_registry.async_update_entity(entity.entity_id, disabled_by=None)
+    assert (
+        async_get_startup_priority(hass, mock_config_entry.entry_id) == PRIORITY_ARMABLE
+    )
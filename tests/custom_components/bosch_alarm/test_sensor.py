@@ -7,9 +7,11 @@ from bosch_alarm_mode2.const import ALARM_MEMORY_PRIORITIES
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
-from homeassistant.const import Platform
+from homeassistant.components.bosch_alarm.const import ALARM_TYPES, DOMAIN
+from homeassistant.const import STATE_UNKNOWN, EntityCategory, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_component import async_update_entity
 
 from . import call_observable, setup_integration
 
@@ -23,6 +25,7 @@ async def platforms() -> AsyncGenerator[None]:
         yield
 
 
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
 async def test_sensor(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -67,3 +70,83 @@ async def test_alarm_faults(
     await call_observable(hass, area.alarm_observer)
 
     assert hass.states.get(entity_id).state == "trouble"
+
+
+async def test_alarm_index_released(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the alarm index of an area is dropped with its last alarm sensor."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    area.alarm_observer.attach.assert_called_once()
+    assert dispatcher.alarm_index(area)["fire"] == "no_issues"
+
+    for entry in er.async_entries_for_config_entry(
+        entity_registry, mock_config_entry.entry_id
+    ):
+        if entry.translation_key.removeprefix("alarms_") in ALARM_TYPES:
+            entity_registry.async_remove(entry.entity_id)
+    await hass.async_block_till_done()
+    area.alarm_observer.detach.assert_called_once()
+
+    # Without an observer the index is no longer cached
+    area.alarms_ids = [ALARM_MEMORY_PRIORITIES.FIRE_TROUBLE]
+    assert dispatcher.alarm_index(area)["fire"] == "trouble"
+
+
+async def test_metric_sensors_disabled_by_default(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_panel: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the panel metric sensors are disabled by default."""
+    await setup_integration(hass, mock_config_entry)
+    unique_id = mock_config_entry.unique_id or mock_config_entry.entry_id
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{unique_id}_push_events_per_minute"
+    )
+    entry = entity_registry.async_get(entity_id)
+    assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert entry.entity_category is EntityCategory.DIAGNOSTIC
+    assert hass.states.get(entity_id) is None
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_metric_sensors(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the panel metric sensors report the metrics of the dispatcher."""
+    await setup_integration(hass, mock_config_entry)
+    unique_id = mock_config_entry.unique_id or mock_config_entry.entry_id
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+
+    area.faults = 1
+    await call_observable(hass, area.ready_observer)
+    assert dispatcher.metrics.events_per_minute == 1
+    # The history sync and reconnect supervisor each attach an observer too
+    observer_count = mock_config_entry.runtime_data.observer_count
+    assert observer_count == dispatcher.observer_count + 2
+    assert dispatcher.metrics.write_latency_mean is not None
+
+    for key, expected in (
+        ("push_events_per_minute", "1"),
+        ("observer_callbacks", str(observer_count)),
+        ("reconnects", "0"),
+        ("command_round_trip", STATE_UNKNOWN),
+        ("command_queue_depth", "0"),
+        ("disarm_confirmation_latency", STATE_UNKNOWN),
+    ):
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{unique_id}_{key}"
+        )
+        await async_update_entity(hass, entity_id)
+        assert hass.states.get(entity_id).state == expected
@@ -2,17 +2,34 @@
 
 import asyncio
 from collections.abc import AsyncGenerator
+from datetime import datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
+from bosch_alarm_mode2.history import HistoryEvent
 import pytest
 import voluptuous as vol
 
 from homeassistant.components.bosch_alarm.const import (
+    ARM_AREAS_SERVICE_NAME,
+    ARM_MODE_HOME,
+    AREAS_ATTR,
+    AFTER_ID_ATTR,
     ATTR_CONFIG_ENTRY_ID,
+    CPROFILE_ATTR,
     DATETIME_ATTR,
+    DISARM_AREAS_SERVICE_NAME,
     DOMAIN,
+    DURATION_ATTR,
+    GET_HISTORY_SERVICE_NAME,
+    LIMIT_ATTR,
+    MODE_ATTR,
+    OUTPUTS_ATTR,
+    PROFILE_SERVICE_NAME,
     SET_DATE_TIME_SERVICE_NAME,
+    SET_OUTPUTS_SERVICE_NAME,
 )
+from homeassistant.components.bosch_alarm.commands import COMMAND_CONCURRENCY
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.util import dt as dt_util
@@ -150,3 +167,288 @@ async def test_set_date_time_service_fails_unloaded(
             },
             blocking=True,
         )
+
+
+async def _start_profile(
+    hass: HomeAssistant, config_entry: MockConfigEntry, **data
+) -> asyncio.Task:
+    """Start a profile and wait for it to begin sampling."""
+    task = asyncio.create_task(
+        hass.services.async_call(
+            DOMAIN,
+            PROFILE_SERVICE_NAME,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, DURATION_ATTR: 1, **data},
+            blocking=True,
+            return_response=True,
+        )
+    )
+    dispatcher = config_entry.runtime_data.dispatcher
+    while dispatcher.profiler is None:
+        await asyncio.sleep(0)
+    return task
+
+
+async def test_profile_service(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the profile service aggregates the hot paths it sampled."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    task = await _start_profile(hass, mock_config_entry)
+
+    mock_panel.panel_faults_ids = [1]
+    for _ in range(3):
+        for callback in mock_panel.faults_observer.attach.call_args_list:
+            callback[0][0]()
+    await dispatcher.async_command(mock_panel.area_arm_all, 1)
+
+    response = await task
+    assert dispatcher.profiler is None
+    assert response["duration"] == 1
+    assert not response.get("cprofile")
+    faults = response["timings"]["callback.faults"]
+    assert faults["count"] == 3
+    assert sum(faults["histogram"].values()) == 3
+    assert faults["max_ms"] >= faults["mean_ms"]
+    assert any(name.startswith("command.") for name in response["timings"])
+
+
+async def test_profile_service_cprofile(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the profile service can write a cProfile dump."""
+    await setup_integration(hass, mock_config_entry)
+    task = await _start_profile(hass, mock_config_entry, **{CPROFILE_ATTR: True})
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            PROFILE_SERVICE_NAME,
+            {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, DURATION_ATTR: 1},
+            blocking=True,
+            return_response=True,
+        )
+
+    response = await task
+    path = Path(response["cprofile"])
+    assert path.parent == Path(hass.config.config_dir)
+    assert path.exists()
+    path.unlink()
+
+
+async def test_get_history_service(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the history is returned one page at a time."""
+    mock_panel.events = [
+        HistoryEvent(i, datetime(2025, 1, 1, 0, i), f"Event {i}") for i in range(25)
+    ]
+    await setup_integration(hass, mock_config_entry)
+
+    events = []
+    data = {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, LIMIT_ATTR: 10}
+    while True:
+        response = await hass.services.async_call(
+            DOMAIN,
+            GET_HISTORY_SERVICE_NAME,
+            data,
+            blocking=True,
+            return_response=True,
+        )
+        assert len(response["events"]) <= 10
+        events.extend(response["events"])
+        if (after_id := response["next_after_id"]) is None:
+            break
+        data[AFTER_ID_ATTR] = after_id
+        # The oldest events are trimmed as new ones arrive between pages
+        new = mock_panel.events[-1].id + 1
+        mock_panel.events.append(
+            HistoryEvent(new, datetime(2025, 1, 1, 0, new), f"Event {new}")
+        )
+        del mock_panel.events[:4]
+
+    assert [event["id"] for event in events] == list(range(27))
+    assert events[3] == {
+        "id": 3,
+        "date": "2025-01-01T00:03:00",
+        "message": "Event 3",
+    }
+
+    # Paging restarts from the oldest event held if the last one was trimmed
+    data[AFTER_ID_ATTR] = 5
+    response = await hass.services.async_call(
+        DOMAIN,
+        GET_HISTORY_SERVICE_NAME,
+        data,
+        blocking=True,
+        return_response=True,
+    )
+    assert response["events"][0]["id"] == 8
+
+
+async def test_get_history_service_fails_bad_limit(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the page size of the history is capped."""
+    await setup_integration(hass, mock_config_entry)
+    with pytest.raises(vol.MultipleInvalid):
+        await hass.services.async_call(
+            DOMAIN,
+            GET_HISTORY_SERVICE_NAME,
+            {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, LIMIT_ATTR: 5000},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_arm_areas_service(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that areas are armed concurrently, up to the command limit."""
+    mock_panel.areas = {area_id: area for area_id in range(1, 11)}
+    in_flight = max_in_flight = 0
+
+    async def area_arm_part(area_id: int) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if area_id == 3:
+            raise asyncio.InvalidStateError("Not connected")
+
+    mock_panel.area_arm_part.side_effect = area_arm_part
+    await setup_integration(hass, mock_config_entry)
+    response = await hass.services.async_call(
+        DOMAIN,
+        ARM_AREAS_SERVICE_NAME,
+        {
+            ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id,
+            AREAS_ATTR: list(range(1, 11)),
+            MODE_ATTR: ARM_MODE_HOME,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert mock_panel.area_arm_part.await_count == 10
+    mock_panel.area_arm_all.assert_not_called()
+    assert max_in_flight == COMMAND_CONCURRENCY
+    assert response["elapsed"] >= 0
+    assert response["results"][:4] == [
+        {"area_id": 1, "success": True},
+        {"area_id": 2, "success": True},
+        {"area_id": 3, "success": False, "error": "Not connected"},
+        {"area_id": 4, "success": True},
+    ]
+
+
+async def test_disarm_areas_service(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that each area is disarmed once."""
+    await setup_integration(hass, mock_config_entry)
+    response = await hass.services.async_call(
+        DOMAIN,
+        DISARM_AREAS_SERVICE_NAME,
+        {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, AREAS_ATTR: [1, 1]},
+        blocking=True,
+        return_response=True,
+    )
+    mock_panel.area_disarm.assert_awaited_once_with(1)
+    assert response["results"] == [{"area_id": 1, "success": True}]
+
+
+async def test_arm_areas_service_fails_unknown_area(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that no area is armed if any of them does not exist."""
+    await setup_integration(hass, mock_config_entry)
+    with pytest.raises(
+        ServiceValidationError,
+        match=f'"{mock_config_entry.title}" has no areas with IDs 5, 6',
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            ARM_AREAS_SERVICE_NAME,
+            {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, AREAS_ATTR: [1, 5, 6]},
+            blocking=True,
+        )
+    mock_panel.area_arm_all.assert_not_called()
+
+
+async def test_set_outputs_service(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that several outputs are set in one call."""
+    mock_panel.outputs = {1: output, 2: output, 3: output}
+    mock_panel.set_output_inactive.side_effect = asyncio.InvalidStateError(
+        "Not connected"
+    )
+    await setup_integration(hass, mock_config_entry)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SET_OUTPUTS_SERVICE_NAME,
+        {
+            ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id,
+            OUTPUTS_ATTR: {"1": "on", 2: True, 3: False},
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert mock_panel.set_output_active.await_args_list == [((1,),), ((2,),)]
+    mock_panel.set_output_inactive.assert_awaited_once_with(3)
+    assert response["results"] == [
+        {"output_id": 1, "success": True},
+        {"output_id": 2, "success": True},
+        {"output_id": 3, "success": False, "error": "Not connected"},
+    ]
+
+
+async def test_set_outputs_service_fails_unknown_output(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    area: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that no output is set if any of them does not exist."""
+    await setup_integration(hass, mock_config_entry)
+    with pytest.raises(
+        ServiceValidationError,
+        match=f'"{mock_config_entry.title}" has no outputs with IDs 7',
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SET_OUTPUTS_SERVICE_NAME,
+            {
+                ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id,
+                OUTPUTS_ATTR: {1: True, 7: True},
+            },
+            blocking=True,
+        )
+    mock_panel.set_output_active.assert_not_called()
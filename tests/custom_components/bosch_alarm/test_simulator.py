@@ -0,0 +1,344 @@
+"""End to end tests for Bosch Alarm against a simulated panel."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from datetime import timedelta
+import time
+
+from bosch_alarm_mode2.const import ALARM_MEMORY_PRIORITIES, CMD, POINT_STATUS
+import pytest
+
+from homeassistant.components.alarm_control_panel import (
+    DOMAIN as ALARM_CONTROL_PANEL_DOMAIN,
+    AlarmControlPanelState,
+)
+from homeassistant.components.bosch_alarm.const import (
+    ARM_AREAS_SERVICE_NAME,
+    AREAS_ATTR,
+    ATTR_CONFIG_ENTRY_ID,
+    DISARM_AREAS_SERVICE_NAME,
+    DOMAIN,
+    OUTPUTS_ATTR,
+    SET_OUTPUTS_SERVICE_NAME,
+)
+from homeassistant.components.bosch_alarm.dispatcher import RECONNECT_GRACE
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_PASSWORD,
+    CONF_PORT,
+    SERVICE_ALARM_ARM_AWAY,
+    SERVICE_ALARM_DISARM,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import setup_integration
+from .simulator import PanelSimulator
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+STATE_TIMEOUT = 10
+
+
+@pytest.fixture
+async def simulator(socket_enabled: None) -> AsyncGenerator[PanelSimulator]:
+    """Serve a simulated panel on localhost."""
+    simulator = PanelSimulator(areas=2, points=16, doors=1, outputs=2)
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
+
+
+@pytest.fixture
+async def simulator_entry(
+    hass: HomeAssistant, simulator: PanelSimulator
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up a config entry connected to the simulated panel."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=str(simulator.serial_number),
+        data={
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_MODEL: "B9512G (US1A)",
+            CONF_PASSWORD: simulator.automation_code,
+        },
+    )
+    await setup_integration(hass, entry)
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _wait_for(condition: Callable[[], bool]) -> float:
+    """Wait for a condition to hold and return how long it took."""
+    start = time.perf_counter()
+    async with asyncio.timeout(STATE_TIMEOUT):
+        while not condition():
+            await asyncio.sleep(0.001)
+    return time.perf_counter() - start
+
+
+async def test_simulator_setup(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test the integration loads the inventory and state of the panel."""
+    assert simulator_entry.state is ConfigEntryState.LOADED
+    panel = simulator_entry.runtime_data.panel
+    assert list(panel.points) == list(simulator.points)
+    assert panel.points[16].name == "Point 16"
+    assert len(panel.events) == len(simulator.history)
+    assert simulator.subscribers
+    assert (
+        hass.states.get("alarm_control_panel.area_2").state
+        == AlarmControlPanelState.DISARMED
+    )
+    assert hass.states.get("binary_sensor.point_1").state == STATE_OFF
+    assert hass.states.get("switch.output_2").state == STATE_OFF
+
+
+async def test_simulator_wrong_code(
+    hass: HomeAssistant, simulator: PanelSimulator
+) -> None:
+    """Test a wrong automation code is rejected by the simulated panel."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_MODEL: "B9512G (US1A)",
+            CONF_PASSWORD: "0000000000",
+        },
+    )
+    await setup_integration(hass, entry)
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+    assert simulator.commands[CMD.REQUEST_CONFIGURED_POINTS] == 0
+
+
+async def test_simulator_arm_disarm(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test arming reaches the panel and its status update the state machine."""
+    entity_id = "alarm_control_panel.area_1"
+    history = len(simulator.history)
+    await hass.services.async_call(
+        ALARM_CONTROL_PANEL_DOMAIN,
+        SERVICE_ALARM_ARM_AWAY,
+        {ATTR_ENTITY_ID: entity_id},
+        blocking=True,
+    )
+    # Status updates are pushed, so the state should not wait for a poll
+    latency = await _wait_for(
+        lambda: hass.states.get(entity_id).state == AlarmControlPanelState.ARMED_AWAY
+    )
+    assert latency < 1
+    assert (
+        hass.states.get("alarm_control_panel.area_2").state
+        == AlarmControlPanelState.DISARMED
+    )
+
+    await hass.services.async_call(
+        ALARM_CONTROL_PANEL_DOMAIN,
+        SERVICE_ALARM_DISARM,
+        {ATTR_ENTITY_ID: entity_id},
+        blocking=True,
+    )
+    await _wait_for(
+        lambda: hass.states.get(entity_id).state == AlarmControlPanelState.DISARMED
+    )
+    events = simulator_entry.runtime_data.panel.events
+    await _wait_for(lambda: len(events) == history + 2)
+    assert "Closing by Area, Area: 1" in events[-2].message
+    assert "Opening by Area, Area: 1" in events[-1].message
+
+    latency = simulator_entry.runtime_data.dispatcher.confirmations.as_dict()["latency"]
+    assert latency["area_arm_all"]["count"] == 1
+    assert latency["area_disarm"]["count"] == 1
+
+
+async def test_simulator_arm_areas(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test every area armed in one service call reaches the state machine."""
+    entity_ids = ["alarm_control_panel.area_1", "alarm_control_panel.area_2"]
+    response = await hass.services.async_call(
+        DOMAIN,
+        ARM_AREAS_SERVICE_NAME,
+        {ATTR_CONFIG_ENTRY_ID: simulator_entry.entry_id, AREAS_ATTR: [1, 2]},
+        blocking=True,
+        return_response=True,
+    )
+    assert all(result["success"] for result in response["results"])
+    await _wait_for(
+        lambda: all(
+            hass.states.get(entity_id).state == AlarmControlPanelState.ARMED_AWAY
+            for entity_id in entity_ids
+        )
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        DISARM_AREAS_SERVICE_NAME,
+        {ATTR_CONFIG_ENTRY_ID: simulator_entry.entry_id, AREAS_ATTR: [1, 2]},
+        blocking=True,
+        return_response=True,
+    )
+    assert all(result["success"] for result in response["results"])
+    await _wait_for(
+        lambda: all(
+            hass.states.get(entity_id).state == AlarmControlPanelState.DISARMED
+            for entity_id in entity_ids
+        )
+    )
+
+
+async def test_simulator_outputs_and_doors(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test output and door commands round trip through the panel."""
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "switch.output_1"},
+        blocking=True,
+    )
+    await _wait_for(lambda: hass.states.get("switch.output_1").state == STATE_ON)
+    assert simulator.outputs[1].active
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: "switch.door_1_locked"},
+        blocking=True,
+    )
+    await _wait_for(lambda: hass.states.get("switch.door_1_locked").state == STATE_OFF)
+    assert simulator.commands[CMD.SET_DOOR_STATE] == 1
+
+
+async def test_simulator_set_outputs(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test every output set in one service call reaches the state machine."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SET_OUTPUTS_SERVICE_NAME,
+        {
+            ATTR_CONFIG_ENTRY_ID: simulator_entry.entry_id,
+            OUTPUTS_ATTR: {1: True, 2: True},
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert all(result["success"] for result in response["results"])
+    await _wait_for(
+        lambda: all(
+            hass.states.get(f"switch.output_{output_id}").state == STATE_ON
+            for output_id in (1, 2)
+        )
+    )
+    assert simulator.commands[CMD.SET_OUTPUT_STATE] == 2
+
+
+async def test_simulator_alarm(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test alarms raised by the panel are fetched and ranked."""
+    simulator.trigger_alarm(1, 3, ALARM_MEMORY_PRIORITIES.BURGLARY_ALARM)
+    await _wait_for(
+        lambda: hass.states.get("sensor.area_1_burglary_alarm_issues").state == "alarm"
+    )
+    simulator.clear_alarms()
+    await _wait_for(
+        lambda: (
+            hass.states.get("sensor.area_1_burglary_alarm_issues").state == "no_issues"
+        )
+    )
+
+
+async def test_simulator_reconnect(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test a short drop only writes the entities that changed while it was down."""
+    panel = simulator_entry.runtime_data.panel
+    changed: list[str] = []
+
+    def record(event) -> None:
+        changed.append(event.data["entity_id"])
+
+    unsub = hass.bus.async_listen("state_changed", record)
+    simulator.disconnect_clients()
+    await _wait_for(lambda: not panel.connection_status())
+    simulator.points[1].status = POINT_STATUS.OPEN[1]
+    await _wait_for(panel.connection_status)
+    await _wait_for(lambda: hass.states.get("binary_sensor.point_1").state == STATE_ON)
+    await hass.async_block_till_done()
+    unsub()
+
+    assert simulator_entry.runtime_data.supervisor.attempts == 1
+    assert changed == ["binary_sensor.point_1"]
+    assert hass.states.get("binary_sensor.point_2").state == STATE_OFF
+
+
+async def test_simulator_connection_lost(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test entities become unavailable when the panel stays unreachable."""
+    panel = simulator_entry.runtime_data.panel
+    await simulator.stop()
+    await _wait_for(lambda: not panel.connection_status())
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RECONNECT_GRACE))
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.point_1").state == STATE_UNAVAILABLE
+
+
+async def test_simulator_event_storm(
+    hass: HomeAssistant,
+    simulator: PanelSimulator,
+    simulator_entry: MockConfigEntry,
+) -> None:
+    """Test every point update of an event storm reaches the state machine."""
+    changes = 0
+
+    def count(event) -> None:
+        nonlocal changes
+        if event.data["entity_id"].startswith("binary_sensor.point_"):
+            changes += 1
+
+    unsub = hass.bus.async_listen("state_changed", count)
+    sent = await simulator.event_storm(rate=1000, duration=0.5)
+    await hass.async_block_till_done()
+    unsub()
+
+    assert sent > 0
+    # Updates of the same point within a flush may be coalesced
+    assert 0 < changes <= sent
+    for point_id, point in simulator.points.items():
+        expected = STATE_ON if point.status in POINT_STATUS.OPEN else STATE_OFF
+        assert hass.states.get(f"binary_sensor.point_{point_id}").state == expected
@@ -1,11 +1,24 @@
 """Tests for Bosch Alarm component."""
 
+import asyncio
 from collections.abc import AsyncGenerator
+from datetime import timedelta
+from functools import partial
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
+from homeassistant.components.bosch_alarm.commands import (
+    PRIORITY_ARM,
+    PRIORITY_DISARM,
+    TARGET_AREA,
+    TARGET_OUTPUT,
+)
+from homeassistant.components.bosch_alarm.confirmations import (
+    CONFIRMATION_TIMEOUT,
+    output_active,
+)
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -17,10 +30,11 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 
 from . import call_observable, setup_integration
 
-from tests.common import MockConfigEntry, snapshot_platform
+from tests.common import MockConfigEntry, async_fire_time_changed, snapshot_platform
 
 
 @pytest.fixture(autouse=True)
@@ -145,3 +159,245 @@ async def test_switch(
     await setup_integration(hass, mock_config_entry)
 
     await snapshot_platform(hass, entity_registry, snapshot, mock_config_entry.entry_id)
+
+
+async def test_command_queue(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a disarm jumps queued output toggles, and the latest one wins."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    release = asyncio.Event()
+    sent: list[tuple[str, int]] = []
+
+    async def send(name: str, target_id: int) -> None:
+        sent.append((name, target_id))
+        await release.wait()
+
+    mock_panel.set_output_active.side_effect = partial(send, "on")
+    mock_panel.set_output_inactive.side_effect = partial(send, "off")
+    mock_panel.area_disarm.side_effect = partial(send, "disarm")
+
+    with patch("homeassistant.components.bosch_alarm.commands.COMMAND_CONCURRENCY", 1):
+        commands = [
+            dispatcher.async_command(
+                mock_panel.set_output_active, 1, target=TARGET_OUTPUT
+            ),
+            dispatcher.async_command(
+                mock_panel.set_output_inactive, 1, target=TARGET_OUTPUT
+            ),
+            dispatcher.async_command(
+                mock_panel.set_output_active, 1, target=TARGET_OUTPUT
+            ),
+            dispatcher.async_command(
+                mock_panel.set_output_active, 1, target=TARGET_OUTPUT
+            ),
+            dispatcher.async_command(
+                mock_panel.area_disarm,
+                1,
+                target=TARGET_AREA,
+                priority=PRIORITY_DISARM,
+            ),
+        ]
+        tasks = [hass.async_create_task(command) for command in commands]
+        await asyncio.sleep(0)
+        assert sent == [("on", 1)]
+        assert dispatcher.commands.depth == 2
+        assert dispatcher.commands.replaced == 1
+        assert dispatcher.commands.deduplicated == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert sent == [("on", 1), ("disarm", 1), ("on", 1)]
+    assert dispatcher.commands.depth == 0
+    assert dispatcher.commands.in_flight == 0
+    assert dispatcher.metrics.command_wait_p95 is not None
+
+
+@pytest.mark.parametrize(
+    ("target", "commands", "expected"),
+    [
+        (
+            TARGET_AREA,
+            [("area_arm_all", PRIORITY_ARM), ("area_disarm", PRIORITY_DISARM)],
+            "area_disarm",
+        ),
+        (
+            TARGET_AREA,
+            [("area_disarm", PRIORITY_DISARM), ("area_arm_all", PRIORITY_ARM)],
+            "area_arm_all",
+        ),
+        (
+            TARGET_OUTPUT,
+            [
+                ("set_output_active", PRIORITY_ARM),
+                ("set_output_inactive", PRIORITY_ARM),
+                ("set_output_active", PRIORITY_ARM),
+            ],
+            "set_output_active",
+        ),
+    ],
+)
+async def test_command_queue_latest_wins(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+    target: str,
+    commands: list[tuple[str, int]],
+    expected: str,
+) -> None:
+    """Test that only the latest waiting command for a target is sent."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    release = asyncio.Event()
+    sent: list[tuple[str, int]] = []
+
+    async def send(name: str, target_id: int) -> None:
+        sent.append((name, target_id))
+        await release.wait()
+
+    mock_panel.set_output_active.side_effect = partial(send, "set_output_active")
+    for name, _ in commands:
+        getattr(mock_panel, name).side_effect = partial(send, name)
+
+    with patch("homeassistant.components.bosch_alarm.commands.COMMAND_CONCURRENCY", 1):
+        # Keep the only slot busy with a command for another output
+        tasks = [
+            hass.async_create_task(
+                dispatcher.async_command(
+                    mock_panel.set_output_active, 2, target=TARGET_OUTPUT
+                )
+            )
+        ]
+        tasks.extend(
+            hass.async_create_task(
+                dispatcher.async_command(
+                    getattr(mock_panel, name), 5, target=target, priority=priority
+                )
+            )
+            for name, priority in commands
+        )
+        await asyncio.sleep(0)
+        assert dispatcher.commands.depth == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert sent == [("set_output_active", 2), (expected, 5)]
+    assert dispatcher.commands.replaced == len(commands) - 1
+
+
+async def test_command_queue_confirmations(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that only the commands that are sent wait for a confirmation."""
+    await setup_integration(hass, mock_config_entry)
+    dispatcher = mock_config_entry.runtime_data.dispatcher
+    confirmations = dispatcher.confirmations
+    mock_panel.set_output_active.__name__ = "set_output_active"
+    mock_panel.set_output_inactive.__name__ = "set_output_inactive"
+    release = asyncio.Event()
+
+    async def send(*args: int) -> None:
+        await release.wait()
+
+    mock_panel.set_output_active.side_effect = send
+    mock_panel.set_output_inactive.side_effect = send
+
+    with patch("homeassistant.components.bosch_alarm.commands.COMMAND_CONCURRENCY", 1):
+        # Keep the only slot busy with a command for another output
+        tasks = [
+            hass.async_create_task(
+                dispatcher.async_command(
+                    mock_panel.set_output_inactive, 2, target=TARGET_OUTPUT
+                )
+            )
+        ]
+        tasks.extend(
+            hass.async_create_task(
+                dispatcher.async_command(
+                    command, 1, target=TARGET_OUTPUT, expect=output_active(output, on)
+                )
+            )
+            for command, on in (
+                (mock_panel.set_output_active, True),
+                (mock_panel.set_output_inactive, False),
+                (mock_panel.set_output_active, True),
+                (mock_panel.set_output_active, True),
+            )
+        )
+        await asyncio.sleep(0)
+        assert dispatcher.commands.replaced == 2
+        assert dispatcher.commands.deduplicated == 1
+        # The replaced commands stopped waiting, and the repeat did not start
+        assert confirmations.pending == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    output.is_active.return_value = True
+    await call_observable(hass, output.status_observer)
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=CONFIRMATION_TIMEOUT)
+    )
+    await hass.async_block_till_done()
+    data = confirmations.as_dict()
+    assert data["pending"] == 0
+    assert data["latency"]["set_output_active"]["count"] == 1
+    assert "set_output_inactive" not in data["latency"]
+    assert data["timeouts"] == {}
+
+
+async def test_command_queue_error(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a failed command is raised to the caller."""
+    await setup_integration(hass, mock_config_entry)
+    mock_panel.set_output_active.side_effect = asyncio.InvalidStateError
+    with pytest.raises(asyncio.InvalidStateError):
+        await hass.services.async_call(
+            SWITCH_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: "switch.output_a"},
+            blocking=True,
+        )
+    assert mock_config_entry.runtime_data.dispatcher.commands.in_flight == 0
+
+
+async def test_command_confirmation_timeout(
+    hass: HomeAssistant,
+    mock_panel: AsyncMock,
+    output: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a command the panel never confirms is counted as timed out."""
+    await setup_integration(hass, mock_config_entry)
+    confirmations = mock_config_entry.runtime_data.dispatcher.confirmations
+    mock_panel.set_output_active.__name__ = "set_output_active"
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "switch.output_a"},
+        blocking=True,
+    )
+    assert confirmations.pending == 1
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=CONFIRMATION_TIMEOUT)
+    )
+    await hass.async_block_till_done()
+    assert confirmations.pending == 0
+    assert confirmations.timeouts == {"set_output_active": 1}
+    assert confirmations.as_dict()["latency"] == {}